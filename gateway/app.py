@@ -2,11 +2,13 @@ import os
 import asyncio
 import httpx
 import docker
+import heapq
 import json
 import math
 import time
 import logging
 import uuid
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from functools import partial
 from fastapi import FastAPI, Request, HTTPException
@@ -15,7 +17,7 @@ from docker.types import DeviceRequest
 from docker.errors import NotFound, APIError
 from dataclasses import dataclass, field
 from enum import Enum
-from huggingface_hub import hf_hub_download, list_repo_files, HfApi
+from huggingface_hub import hf_hub_download, list_repo_files, snapshot_download, HfApi
 import yaml
 import placement
 from config_loader import (
@@ -170,7 +172,14 @@ RESOLVED_DOCKER_NETWORK = None
 TOTAL_GPU_VRAM = 0  # in MiB
 GPU_VRAM = {}  # uuid -> {"total": int MiB, "used": float MiB}; per-GPU foundation for multi-GPU placement
 known_footprints = {}  # repo -> {"per_gpu_mib": float, "effective_tp": int, "measured_at": float}
-active_containers = {}  # container_name -> ContainerState (entries exist while LOADING/READY/STOPPING)
+footprints_save_lock = asyncio.Lock()  # serializes save_known_footprints_async (shared .tmp path)
+# container_name -> ContainerState (entries exist while LOADING/READY/STOPPING). Kept in access order:
+# an entry moves to the end whenever its last_request_time is bumped, so READY entries iterate
+# least-recently-used first.
+active_containers = OrderedDict()
+# model_id -> its newest ContainerState: secondary index over active_containers so the per-request
+# READY lookup is O(1). Mutated only via _track_container / _untrack_container (under state_lock).
+containers_by_model = {}
 # One lock guards ALL of active_containers: membership, status transitions, slot allocation, and the
 # VRAM accounting derived from it (reservations now live ON the entries, not in a side dict). It is
 # held ONLY for in-memory decisions/mutations — NEVER across a container start, get_gpu_vram, or
@@ -178,6 +187,9 @@ active_containers = {}  # container_name -> ContainerState (entries exist while
 state_lock = asyncio.Lock()
 container_start_locks = {}  # model_id -> asyncio.Lock for preventing concurrent container starts
 download_locks = {}  # model_id -> asyncio.Lock for preventing concurrent downloads
+# model_id (GGUF repo[:quant] as configured) -> (host local_path, tokenizer_repo) of its resolved GGUF
+# file. Checked before download_locks so a reload after eviction skips the HF lookup entirely.
+gguf_path_cache: "dict[str, tuple[str, str]]" = {}
 # gpu_uuid -> asyncio.Lock serializing vLLM engine startup across containers that SHARE a card. vLLM's
 # memory-profiling step measures whole-device free VRAM; a neighbor allocating/freeing on the same card
 # mid-profile corrupts it (worker dies with "Error in memory profiling"). Held for the whole start->READY
@@ -190,6 +202,20 @@ gpu_startup_locks = {}
 # JSON-clean.
 loading_tasks = {}
 
+# Reconciler schedule: a min-heap of (due_time, container_name) for the next time each container needs
+# a look (idle expiry, stale in-flight clamp, LOADING owner check). expiry_due holds each container's
+# authoritative due time; heap entries that no longer match it are stale and skipped when popped.
+# expiry_wakeup is set when a check is scheduled earlier than the current head so the monitor re-arms.
+expiry_heap = []
+expiry_due = {}  # container_name -> due_time (time.time() seconds)
+expiry_wakeup = asyncio.Event()
+LOADING_CHECK_INTERVAL = 60  # seconds between owner-liveness checks of a LOADING entry
+# Container slot allocator: slot N names container f"{VLLM_CONTAINER_PREFIX}_{N}". free_slots is a
+# min-heap of released slots below next_slot, so allocation always takes the lowest free index in
+# O(log N) without rescanning active_containers. Guarded by state_lock.
+free_slots = []
+next_slot = 0
+
 # Multi-GPU placement state (resolved at startup; see resolve_managed_pools)
 MANAGED_POOLS = {}  # pool_name -> [gpu_uuid, ...]: the GPUs this gateway manages, grouped into pools
 MANAGED_GPUS = []   # flat list of managed gpu_uuids (union of MANAGED_POOLS values)
@@ -227,6 +253,69 @@ class ContainerState:
     active_requests: int = 0        # in-flight requests being proxied to this container
     loaded_at: float = 0.0          # time.time() when it became READY (anti-thrash cooldown)
 
+def _track_container(entry: ContainerState):
+    """Insert an entry into active_containers and the per-model index. Caller holds state_lock."""
+    active_containers[entry.container_name] = entry
+    containers_by_model[entry.model_id] = entry
+    _schedule_check(entry.container_name, _next_check_time(entry, time.time()))
+
+def _untrack_container(container_name: str) -> "ContainerState | None":
+    """Drop an entry from active_containers and the per-model index. Caller holds state_lock.
+
+    The index entry is removed only if it still points at THIS entry — a newer entry for the same
+    model (e.g. a fresh LOADING while the old one is STOPPING) keeps its slot in the index."""
+    state = active_containers.pop(container_name, None)
+    if state is not None:
+        if containers_by_model.get(state.model_id) is state:
+            del containers_by_model[state.model_id]
+        _release_slot(container_name)
+    expiry_due.pop(container_name, None)  # any queued heap entry for it is now stale
+    return state
+
+def _alloc_slot() -> int:
+    """Take the lowest free container slot index. Caller holds state_lock."""
+    global next_slot
+    if free_slots:
+        return heapq.heappop(free_slots)
+    slot = next_slot
+    next_slot += 1
+    return slot
+
+def _release_slot(container_name: str):
+    """Return a container's slot to the free heap. Caller holds state_lock."""
+    try:
+        heapq.heappush(free_slots, int(container_name.rsplit('_', 1)[-1]))
+    except ValueError:
+        logging.warning(f"Container name {container_name} carries no slot index; not recycled.")
+
+def _next_check_time(state: ContainerState, now: float) -> "float | None":
+    """When the reconciler next needs to look at `state` (None: never — STOPPING is owned by
+    stop_container).
+
+    LOADING -> re-check owner liveness every LOADING_CHECK_INTERVAL. READY -> its idle expiry
+    (unless always_on / timeout 0), or the stale in-flight clamp horizon, whichever is sooner."""
+    if state.status == ContainerStatus.LOADING:
+        return now + LOADING_CHECK_INTERVAL
+    if state.status != ContainerStatus.READY:
+        return None
+    stale_after = GATEWAY_REQUEST_STALE_FACTOR * GATEWAY_REQUEST_TIMEOUT
+    due = state.last_request_time + stale_after
+    if due <= now:
+        due = now + stale_after
+    if not state.always_on and state.inactivity_timeout > 0:
+        due = min(due, state.last_request_time + state.inactivity_timeout)
+    return due
+
+def _schedule_check(container_name: str, due: "float | None"):
+    """(Re)schedule the reconciler's next look at a container, superseding any earlier schedule."""
+    if due is None:
+        expiry_due.pop(container_name, None)
+        return
+    if not expiry_heap or due < expiry_heap[0][0]:
+        expiry_wakeup.set()
+    expiry_due[container_name] = due
+    heapq.heappush(expiry_heap, (due, container_name))
+
 # --- Docker and HTTP Clients ---
 docker_client = docker.from_env()
 
@@ -264,14 +353,10 @@ async def lifespan(_app: FastAPI):
     # Startup
     global RESOLVED_DOCKER_NETWORK
     try:
-        gateway_container = await run_in_executor(docker_client.containers.get, GATEWAY_CONTAINER_NAME)
-        networks = gateway_container.attrs['NetworkSettings']['Networks']
-        for network_name in networks:
-            if network_name.endswith(DOCKER_NETWORK_NAME):
-                RESOLVED_DOCKER_NETWORK = network_name
-                logging.info(f"Successfully resolved Docker network to: {RESOLVED_DOCKER_NETWORK}")
-                break
-        if not RESOLVED_DOCKER_NETWORK:
+        RESOLVED_DOCKER_NETWORK = await run_in_executor(_resolve_network_sync)
+        if RESOLVED_DOCKER_NETWORK:
+            logging.info(f"Successfully resolved Docker network to: {RESOLVED_DOCKER_NETWORK}")
+        else:
             RESOLVED_DOCKER_NETWORK = DOCKER_NETWORK_NAME
             logging.warning(f"Could not find network ending in '{DOCKER_NETWORK_NAME}'. Falling back to base name.")
     except NotFound:
@@ -305,6 +390,44 @@ async def run_in_executor(func, *args, **kwargs):
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(None, partial(func, *args, **kwargs))
 
+# Blocking docker-py sequences bundled so each runs in ONE executor hop instead of one per API call.
+
+def _run_container_sync(image: str, **run_kwargs):
+    """containers.run + reload (so attrs carry the network IP) in a single thread-pool hop."""
+    container = docker_client.containers.run(image, **run_kwargs)
+    container.reload()
+    return container
+
+def _stop_and_remove_sync(container_name: str):
+    """containers.get + stop + remove in a single thread-pool hop. Raises NotFound / APIError."""
+    container = docker_client.containers.get(container_name)
+    container.stop()
+    container.remove()
+
+def _resolve_network_sync() -> "str | None":
+    """Resolve DOCKER_NETWORK_NAME to the actual (compose-prefixed) network name.
+
+    Asks dockerd for networks by name filter first (a small list response) and accepts it only if exactly
+    one network is named '<name>' or '<project>_<name>'. Only when that is ambiguous (several compose
+    projects on one host) or empty does it fall back to fetching the gateway container's full
+    inspect JSON and reading the networks it is actually attached to. Raises NotFound from that
+    fallback if the gateway container doesn't exist."""
+    # The name filter is a substring match, so narrow to the exact name or a compose prefix.
+    candidates = [n.name for n in docker_client.networks.list(names=[DOCKER_NETWORK_NAME])
+                  if n.name == DOCKER_NETWORK_NAME or n.name.endswith(f"_{DOCKER_NETWORK_NAME}")]
+    if len(candidates) == 1:
+        return candidates[0]
+    gateway_container = docker_client.containers.get(GATEWAY_CONTAINER_NAME)
+    for network_name in gateway_container.attrs['NetworkSettings']['Networks']:
+        if network_name.endswith(DOCKER_NETWORK_NAME):
+            return network_name
+    return None
+
+def _reload_and_top_sync(container) -> dict:
+    """container.reload + top in a single thread-pool hop (attrs refreshed for State.Pid)."""
+    container.reload()
+    return container.top()
+
 async def run_nvidia_smi_in_container(command: list[str], pid_mode: "str | None" = None) -> str:
     """Runs an nvidia-smi command in a temporary container and returns the output.
 
@@ -402,8 +525,15 @@ def load_known_footprints():
         logging.error(f"Could not load memory footprints file: {e}")
         known_footprints = {}
 
-def save_known_footprints():
-    """Saves the known footprints back to the JSON file."""
+def save_known_footprints(data: "dict | None" = None):
+    """Saves the known footprints (or the given snapshot of them) back to the JSON file.
+
+    Written atomically: the JSON goes to a sibling .tmp file, is fsynced, then os.replace()d over
+    the real file, so a crash mid-write leaves the previous file intact instead of a truncated one
+    (which would drop every measured footprint and force re-discovery on the next start)."""
+    if data is None:
+        data = known_footprints
+    tmp_path = MEMORY_FOOTPRINT_FILE + ".tmp"
     try:
         if os.path.isdir(MEMORY_FOOTPRINT_FILE):
             logging.error(f"Cannot save footprints: '{MEMORY_FOOTPRINT_FILE}' is a directory, not a file!")
@@ -414,14 +544,25 @@ def save_known_footprints():
         if parent_dir and not os.path.exists(parent_dir):
             os.makedirs(parent_dir, exist_ok=True)
 
-        with open(MEMORY_FOOTPRINT_FILE, 'w') as f:
-            json.dump(known_footprints, f, indent=4)
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, MEMORY_FOOTPRINT_FILE)
     except IOError as e:
         logging.error(f"Could not save memory footprints file: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
 
 async def save_known_footprints_async():
-    """Persist footprints off the event loop (blocking file I/O must not run on the loop)."""
-    await run_in_executor(save_known_footprints)
+    """Persist footprints off the event loop (blocking file I/O must not run on the loop).
+
+    The snapshot is taken on the loop, so the worker thread never iterates a dict that a concurrent
+    coroutine is mutating; footprints_save_lock keeps two saves from racing on the shared .tmp file."""
+    async with footprints_save_lock:
+        await run_in_executor(save_known_footprints, dict(known_footprints))
 
 async def get_used_vram() -> float:
     """Gets currently used GPU VRAM (MiB) across the managed GPU(s)."""
@@ -458,11 +599,10 @@ async def container_host_pids(container) -> set:
     container's init PID. Returns an empty set on failure (caller falls back)."""
     pids = set()
     try:
-        await run_in_executor(container.reload)
+        top = await run_in_executor(_reload_and_top_sync, container)
         init_pid = container.attrs.get("State", {}).get("Pid")
         if init_pid:
             pids.add(int(init_pid))
-        top = await run_in_executor(container.top)
         titles = (top or {}).get("Titles") or []
         procs = (top or {}).get("Processes") or []
         pid_idx = titles.index("PID") if "PID" in titles else 1
@@ -590,12 +730,70 @@ def infer_base_model_from_gguf_repo(gguf_repo_id: str) -> str:
     logging.info(f"Inferred base model '{base_model}' from GGUF repo '{gguf_repo_id}'")
     return base_model
 
+def _resolve_quant_hint(repo_id: str, quant_hint: str = "") -> str:
+    """Quantization string used to pick a GGUF file: explicit quant_hint arg > hint extracted from
+    the repo name (e.g. "google/gemma-3-12b-it-qat-q4_0-gguf" -> "q4_0"). "" when there is none."""
+    import re
+    if quant_hint:
+        return quant_hint.lower()
+    repo_name = repo_id.split('/')[-1]  # e.g., "gemma-3-12b-it-qat-q4_0-gguf"
+    quant_patterns = re.findall(r'q\d+_[k0-9]+|q\d+', repo_name.lower())
+    return quant_patterns[-1] if quant_patterns else ""
+
+def _select_gguf_file(gguf_files: "list[str]", resolved_hint: str) -> "tuple[str, bool]":
+    """Pick one file from gguf_files. Returns (filename, hint_matched): the first file matching
+    resolved_hint when one does, else the first file (hint_matched=False)."""
+    if resolved_hint:
+        matching_files = [f for f in gguf_files if resolved_hint in f.lower()]
+        if matching_files:
+            return matching_files[0], True
+    return gguf_files[0], False
+
+# Process-lifetime cache of each repo's .gguf listing (from list_repo_files), so an un-hinted
+# request can be resolved offline to the same file the network path picks.
+_gguf_listing_cache: "dict[str, list[str]]" = {}
+
+def _cached_gguf_path(repo_id: str, quant_hint: str, token) -> "str | None":
+    """Resolve a GGUF file from the local HF cache only (no network). Returns the local path, or
+    None when the repo isn't cached or the cached files don't unambiguously answer the request.
+
+    A cached file is accepted only when it matches the quantization hint, or — with no hint — when
+    it is the file the network path would pick from the repo's listing (gguf_files[0]). Without a
+    listing from earlier in this process there is no offline answer: the cache alone can't tell a
+    single-file repo from a multi-quant one whose other entry downloaded a different quant."""
+    resolved_hint = _resolve_quant_hint(repo_id, quant_hint)
+    if resolved_hint:
+        try:
+            snapshot = snapshot_download(repo_id, token=token, cache_dir=HOST_CACHE_DIR, local_files_only=True)
+        except Exception:
+            return None
+        cached = []
+        for root, _dirs, names in os.walk(snapshot):
+            for name in names:
+                if name.endswith('.gguf'):
+                    cached.append(os.path.relpath(os.path.join(root, name), snapshot).replace(os.sep, '/'))
+        cached.sort()
+        filename, matched = _select_gguf_file(cached, resolved_hint) if cached else (None, False)
+        if not matched:
+            return None
+    else:
+        listing = _gguf_listing_cache.get(repo_id)
+        if not listing:
+            return None
+        filename = listing[0]
+    try:
+        return hf_hub_download(repo_id=repo_id, filename=filename, token=token,
+                               cache_dir=HOST_CACHE_DIR, local_files_only=True)
+    except Exception:
+        return None
+
 async def download_gguf_from_repo(repo_id: str, quant_hint: str = "") -> tuple[str, str]:
     """
     Downloads a GGUF file from a HuggingFace repo and returns (local_path, tokenizer_repo).
     Returns the path to the downloaded GGUF file and the inferred base model repo for tokenizer.
     Uses async executor to avoid blocking the event loop during large downloads.
     quant_hint: optional quantization string (e.g. "Q4_K_M") to select a specific file.
+    A file already in the local HF cache is resolved offline first, skipping the repo listing.
     """
     try:
         logging.info(f"Attempting to download GGUF file from repo: {repo_id}")
@@ -603,6 +801,12 @@ async def download_gguf_from_repo(repo_id: str, quant_hint: str = "") -> tuple[s
         # Prepare token (handle empty strings)
         token = HF_TOKEN if HF_TOKEN and HF_TOKEN.strip() else None
 
+        # Offline first: a file already in the cache needs neither list_repo_files nor a download.
+        local_path = await run_in_executor(_cached_gguf_path, repo_id, quant_hint, token)
+        if local_path:
+            logging.info(f"Using cached GGUF file: {local_path}")
+            return local_path, infer_base_model_from_gguf_repo(repo_id)
+
         # List all files in the repo to find .gguf files (run in thread pool)
         loop = asyncio.get_event_loop()
         files = await loop.run_in_executor(
@@ -610,6 +814,7 @@ async def download_gguf_from_repo(repo_id: str, quant_hint: str = "") -> tuple[s
             partial(list_repo_files, repo_id, token=token)
         )
         gguf_files = [f for f in files if f.endswith('.gguf')]
+        _gguf_listing_cache[repo_id] = gguf_files
 
         if not gguf_files:
             raise ValueError(f"No GGUF files found in repo {repo_id}")
@@ -620,20 +825,10 @@ async def download_gguf_from_repo(repo_id: str, quant_hint: str = "") -> tuple[s
         gguf_filename = gguf_files[0]  # Default to first file
 
         if len(gguf_files) > 1:
-            # Use explicit quant_hint if provided, otherwise extract from repo name
-            import re
-            if quant_hint:
-                resolved_hint = quant_hint.lower()
-            else:
-                repo_name = repo_id.split('/')[-1]  # e.g., "gemma-3-12b-it-qat-q4_0-gguf"
-                quant_patterns = re.findall(r'q\d+_[k0-9]+|q\d+', repo_name.lower())
-                resolved_hint = quant_patterns[-1] if quant_patterns else ""
-
+            resolved_hint = _resolve_quant_hint(repo_id, quant_hint)
             if resolved_hint:
-                matching_files = [f for f in gguf_files if resolved_hint in f.lower()]
-
-                if matching_files:
-                    gguf_filename = matching_files[0]
+                gguf_filename, matched = _select_gguf_file(gguf_files, resolved_hint)
+                if matched:
                     logging.info(f"Selected GGUF file '{gguf_filename}' based on quantization hint '{resolved_hint}'")
                 else:
                     logging.warning(f"No GGUF file matched quantization hint '{resolved_hint}', using '{gguf_filename}'")
@@ -763,41 +958,62 @@ async def shutdown_inactive_containers():
         than GATEWAY_REQUEST_STALE_FACTOR x GATEWAY_REQUEST_TIMEOUT) is clamped to 0 so it can be
         evicted again — best-effort backstop for an undriven streaming generator (G7). The
         generator's finally remains the primary decrement.
+
+    Instead of waking on a fixed tick and scanning every container under state_lock, the monitor
+    sleeps until the earliest due time in expiry_heap (or until expiry_wakeup signals an earlier
+    one) and only inspects the containers that are due. last_request_time updates don't reschedule:
+    a check that fires early simply re-arms at the container's new expiry.
     """
     logging.info("Starting inactivity monitor + reconciler (owner-liveness reaping; always_on never unloaded).")
     stale_after = GATEWAY_REQUEST_STALE_FACTOR * GATEWAY_REQUEST_TIMEOUT
     while True:
         try:
-            await asyncio.sleep(60)
+            expiry_wakeup.clear()
+            timeout = max(0.0, expiry_heap[0][0] - time.time()) if expiry_heap else None
+            try:
+                await asyncio.wait_for(expiry_wakeup.wait(), timeout=timeout)
+                continue  # an earlier check was scheduled -> recompute the wait
+            except asyncio.TimeoutError:
+                pass
+
             now = time.time()
+            due_names = []
+            while expiry_heap and expiry_heap[0][0] <= now:
+                due, name = heapq.heappop(expiry_heap)
+                if expiry_due.get(name) == due:
+                    del expiry_due[name]
+                    due_names.append(name)
+            if not due_names:
+                continue
+
             inactive_containers = []
-            orphans = []
             async with state_lock:
-                for name, state in active_containers.items():
+                for name in due_names:
+                    state = active_containers.get(name)
+                    if state is None:
+                        continue
                     if state.status == ContainerStatus.LOADING:
                         task = loading_tasks.get(name)
                         # Orphan iff no live owner. Belt-and-suspenders: also reap if it has somehow
                         # outlived the absolute ceiling.
                         if (task is None or task.done()) or (now - state.created_at > GATEWAY_LOADING_TIMEOUT):
-                            orphans.append(name)
-                        continue
-                    if state.status != ContainerStatus.READY:
-                        continue  # STOPPING is owned by stop_container
-                    # G7: self-heal a leaked in-flight count on an otherwise-idle container.
-                    if state.active_requests > 0 and (now - state.last_request_time) > stale_after:
-                        logging.warning(f"Clamping stale active_requests={state.active_requests} on {name} "
-                                        f"(idle {int(now - state.last_request_time)}s) -> 0.")
-                        state.active_requests = 0
-                    if state.always_on or state.inactivity_timeout <= 0:
-                        continue
-                    if now - state.last_request_time > state.inactivity_timeout:
-                        inactive_containers.append(name)
-                # Reap orphaned LOADING entries in-place (no container to stop — start never finished).
-                for name in orphans:
-                    logging.warning(f"Reaping orphaned LOADING entry {name} (owner task absent/done); "
-                                    f"reclaiming its reservation.")
-                    active_containers.pop(name, None)
-                    loading_tasks.pop(name, None)
+                            # Reap in-place (no container to stop — start never finished).
+                            logging.warning(f"Reaping orphaned LOADING entry {name} (owner task absent/done); "
+                                            f"reclaiming its reservation.")
+                            _untrack_container(name)
+                            loading_tasks.pop(name, None)
+                            continue
+                    elif state.status == ContainerStatus.READY:
+                        # G7: self-heal a leaked in-flight count on an otherwise-idle container.
+                        if state.active_requests > 0 and (now - state.last_request_time) >= stale_after:
+                            logging.warning(f"Clamping stale active_requests={state.active_requests} on {name} "
+                                            f"(idle {int(now - state.last_request_time)}s) -> 0.")
+                            state.active_requests = 0
+                        if (not state.always_on and state.inactivity_timeout > 0
+                                and now - state.last_request_time >= state.inactivity_timeout):
+                            inactive_containers.append(name)
+                            continue
+                    _schedule_check(name, _next_check_time(state, now))
 
             # Stop idle containers outside the lock (I/O).
             for name in inactive_containers:
@@ -806,6 +1022,7 @@ async def shutdown_inactive_containers():
 
         except Exception as e:
             logging.error(f"Error in inactivity monitor: {e}", exc_info=True)
+            await asyncio.sleep(1)  # don't spin if the failure repeats
 
 async def stop_container(container_name: str, drain_timeout: float = 30.0):
     """Gracefully stop+remove a container: flip STOPPING (off routing + fit math), drain in-flight,
@@ -838,10 +1055,8 @@ async def stop_container(container_name: str, drain_timeout: float = 30.0):
     try:
         async with _gpu_startup_gate(state.gpu_uuids if state else None):
             try:
-                container = await run_in_executor(docker_client.containers.get, container_name)
                 logging.info(f"Stopping container {container_name}...")
-                await run_in_executor(container.stop)
-                await run_in_executor(container.remove)
+                await run_in_executor(_stop_and_remove_sync, container_name)
                 logging.info(f"Container {container_name} stopped and removed.")
             except NotFound:
                 logging.warning(f"Attempted to stop container {container_name}, but it was not found.")
@@ -850,7 +1065,7 @@ async def stop_container(container_name: str, drain_timeout: float = 30.0):
     finally:
         # Step 4: drop the entry (single removal site for a STOPPING entry).
         async with state_lock:
-            active_containers.pop(container_name, None)
+            _untrack_container(container_name)
 
 def _hf_auth_headers() -> dict:
     """Authorization header for huggingface.co requests when a token is configured.
@@ -862,15 +1077,13 @@ def _hf_auth_headers() -> dict:
     return {"Authorization": f"Bearer {tok}"} if tok else {}
 
 async def hf_repo_exists(repo_id: str) -> bool:
-    """Return True if repo_id has a readable config.json on HuggingFace."""
+    """Return True if repo_id has a readable config.json on HuggingFace.
+
+    Goes through the config.json cache, so the max-length lookup that follows a successful check
+    costs no second request."""
     if not repo_id:
         return False
-    url = f"https://huggingface.co/{repo_id}/raw/main/config.json"
-    try:
-        resp = await http_client.get(url, timeout=5, headers=_hf_auth_headers())
-        return resp.status_code == 200
-    except Exception:
-        return False
+    return await _fetch_config_json(f"https://huggingface.co/{repo_id}/raw/main/config.json") is not None
 
 # Process-lifetime cache of parsed config.json by URL (a repo's config is immutable), so
 # get_model_max_len and get_model_kv_spec don't double-fetch the same file per cold start.
@@ -884,18 +1097,30 @@ def _config_url_for(model_id: str, tokenizer_repo: "str | None" = None) -> "str
     return f"https://huggingface.co/{model_id}/raw/main/config.json"
 
 async def _fetch_config_json(config_url: str) -> "dict | None":
-    """Fetch + cache a config.json. Returns the parsed dict, or None on any failure."""
+    """Fetch + cache a config.json. Returns the parsed dict, or None on any failure.
+
+    Only definitive answers are cached: a parsed config, or a 404/401 (missing repo / no access).
+    Timeouts, connection errors, 429s and 5xx return None uncached, so the next call retries instead
+    of treating the repo as nonexistent for the rest of the process."""
     if config_url in _config_json_cache:
         return _config_json_cache[config_url]
-    cfg = None
     try:
         resp = await http_client.get(config_url, follow_redirects=True, timeout=httpx.Timeout(10.0),
                                      headers=_hf_auth_headers())
+    except Exception as e:
+        logging.warning(f"Could not fetch {config_url}: {e}")
+        return None
+    if resp.status_code in (401, 404):
+        logging.warning(f"Could not fetch {config_url}: HTTP {resp.status_code}")
+        _config_json_cache[config_url] = None
+        return None
+    try:
         resp.raise_for_status()
         parsed = resp.json()
-        cfg = parsed if isinstance(parsed, dict) else None
     except Exception as e:
         logging.warning(f"Could not fetch {config_url}: {e}")
+        return None
+    cfg = parsed if isinstance(parsed, dict) else None
     _config_json_cache[config_url] = cfg
     return cfg
 
@@ -1198,28 +1423,29 @@ async def start_model_container(model_id: str, container_name: str, model_cfg: M
                          f"Will download '{resolved_model_id}' with quant hint '{gguf_quant_hint}'.")
 
     if is_gguf_repo(resolved_model_id):
-        # Ensure only one download per model at a time (protect lock creation with global lock)
-        async with state_lock:
-            if model_id not in download_locks:
-                download_locks[model_id] = asyncio.Lock()
-            download_lock = download_locks[model_id]
-
-        async with download_lock:
-            logging.info(f"Detected GGUF repo: {resolved_model_id}. Downloading GGUF file...")
-            actual_model_path, tokenizer_repo = await download_gguf_from_repo(resolved_model_id, gguf_quant_hint)
-            # Translate host path to the path as seen inside the container.
-            # HOST_CACHE_DIR is mounted at CONTAINER_CACHE_MOUNT inside every vLLM container.
-            if actual_model_path.startswith(HOST_CACHE_DIR):
-                actual_model_path = actual_model_path.replace(HOST_CACHE_DIR, CONTAINER_CACHE_MOUNT, 1)
-            logging.info(f"Container model path: {actual_model_path}")
+        # Reload after eviction: reuse the file resolved on the first start (if still on disk) without
+        # taking the download lock or touching the HF API.
+        cached = gguf_path_cache.get(model_id)
+        if cached and os.path.exists(cached[0]):
+            actual_model_path, tokenizer_repo = cached
+            logging.info(f"Reusing resolved GGUF file for {model_id}: {actual_model_path}")
+        else:
+            # Ensure only one download per model at a time (protect lock creation with global lock)
+            async with state_lock:
+                if model_id not in download_locks:
+                    download_locks[model_id] = asyncio.Lock()
+                download_lock = download_locks[model_id]
 
-    # Only fetch and set max_model_len when this model has a configured cap (> 0).
-    # When no cap is set (0), let vLLM auto-detect the correct value for the model.
-    # The configured value is capped to the model's native max to avoid startup failures.
-    final_max_len = 0
-    if model_cfg.max_model_len > 0:
-        model_max_len = await get_model_max_len(tokenizer_repo if tokenizer_repo else model_id)
-        final_max_len = min(model_max_len, model_cfg.max_model_len) if model_max_len > 0 else model_cfg.max_model_len
+            async with download_lock:
+                logging.info(f"Detected GGUF repo: {resolved_model_id}. Downloading GGUF file...")
+                actual_model_path, tokenizer_repo = await download_gguf_from_repo(resolved_model_id, gguf_quant_hint)
+                gguf_path_cache[model_id] = (actual_model_path, tokenizer_repo)
+
+        # Translate host path to the path as seen inside the container.
+        # HOST_CACHE_DIR is mounted at CONTAINER_CACHE_MOUNT inside every vLLM container.
+        if actual_model_path.startswith(HOST_CACHE_DIR):
+            actual_model_path = actual_model_path.replace(HOST_CACHE_DIR, CONTAINER_CACHE_MOUNT, 1)
+        logging.info(f"Container model path: {actual_model_path}")
 
     # --- Build vLLM command from the resolved per-model config ---
     # Always present: --model, --gpu-memory-utilization, --tensor-parallel-size.
@@ -1229,7 +1455,9 @@ async def start_model_container(model_id: str, container_name: str, model_cfg: M
         command.extend(["--tensor-parallel-size", str(tp)])
 
     # Add GGUF-specific parameters if this is a GGUF model
-    if is_gguf_model(actual_model_path) or tokenizer_repo:
+    is_gguf = is_gguf_model(actual_model_path) or bool(tokenizer_repo)
+    config_repo = None if is_gguf else model_id  # repo whose config.json gives the native max length
+    if is_gguf:
         # Verify the inferred tokenizer repo actually exists on HuggingFace before using it.
         # Third-party GGUF hosters (e.g. TheBloke) produce inferred names that don't exist.
         if tokenizer_repo and not await hf_repo_exists(tokenizer_repo):
@@ -1240,16 +1468,28 @@ async def start_model_container(model_id: str, container_name: str, model_cfg: M
         if tokenizer_repo:
             command.extend(["--tokenizer", tokenizer_repo])
             command.extend(["--hf-config-path", tokenizer_repo])
+            config_repo = tokenizer_repo
             logging.info(f"Using tokenizer and config from {tokenizer_repo} for GGUF model")
         else:
             tokenizer_path = extract_tokenizer_from_gguf_path(actual_model_path)
             if tokenizer_path and await hf_repo_exists(tokenizer_path):
                 command.extend(["--tokenizer", tokenizer_path])
                 command.extend(["--hf-config-path", tokenizer_path])
+                config_repo = tokenizer_path
                 logging.info(f"Using tokenizer and config from {tokenizer_path} for GGUF model {model_id}")
             else:
                 logging.warning(f"No valid tokenizer found for GGUF model {model_id}. Using model's embedded tokenizer.")
 
+    # Only fetch and set max_model_len when this model has a configured cap (> 0).
+    # When no cap is set (0), let vLLM auto-detect the correct value for the model.
+    # The configured value is capped to the model's native max to avoid startup failures.
+    # Resolved after the GGUF block so a GGUF model without a verified config repo skips the
+    # (futile) lookup entirely; a verified one reuses the config.json fetched to verify it.
+    final_max_len = 0
+    if model_cfg.max_model_len > 0:
+        model_max_len = await get_model_max_len(config_repo) if config_repo else 0
+        final_max_len = min(model_max_len, model_cfg.max_model_len) if model_max_len > 0 else model_cfg.max_model_len
+
     # Conditional config-driven flags.
     if final_max_len > 0:
         command.extend(["--max-model-len", str(final_max_len)])
@@ -1287,7 +1527,7 @@ async def start_model_container(model_id: str, container_name: str, model_cfg: M
         logging.info(f"Starting container {container_name} on GPU(s) {gpu_uuids or 'default'} "
                      f"with command: {' '.join(command)}")
         new_container = await run_in_executor(
-            docker_client.containers.run,
+            _run_container_sync,
             vllm_image,
             command=command,
             name=container_name,
@@ -1309,7 +1549,6 @@ async def start_model_container(model_id: str, container_name: str, model_cfg: M
                 VLLM_TEMP_DIR: {'bind': '/tmp', 'mode': 'rw'}  # For temporary GGUF downloads
             }
         )
-        await run_in_executor(new_container.reload)
 
         # Safely retrieve network IP address
         networks = new_container.attrs.get('NetworkSettings', {}).get('Networks', {})
@@ -1327,11 +1566,23 @@ async def start_model_container(model_id: str, container_name: str, model_cfg: M
         vllm_base_url = f"http://{ip_address}:{VLLM_PORT}"
         logging.info(f"Starting health checks for {model_id}. This may take several minutes for large models...")
 
-        for i in range(1800): # ~1 hour timeout (1800 * 2s = 3600s)
-            await asyncio.sleep(2)
+        # Exponential backoff (0.1s, 0.15s, ... capped at 5s) within a ~1 hour budget: a fast model is
+        # seen READY within ~100ms of vLLM coming up, while a slow one isn't polled every 2s for minutes.
+        start_time = time.monotonic()
+        deadline = start_time + 3600
+        delay = 0.1
+        attempt = 0
+        next_status_check = start_time  # container crash check, every ~20s of wall-clock
+        next_progress_log = start_time + 30  # "still loading" log, every ~30s of wall-clock
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, 5.0)
+            attempt += 1
+            now = time.monotonic()
 
             # Check container is still running every 20 seconds to detect crashes early
-            if i % 10 == 0:
+            if now >= next_status_check:
+                next_status_check = now + 20
                 try:
                     await run_in_executor(new_container.reload)
                     status = new_container.status
@@ -1352,26 +1603,25 @@ async def start_model_container(model_id: str, container_name: str, model_cfg: M
             try:
                 response = await http_client.get(f"{vllm_base_url}/health", timeout=2)
                 if response.status_code == 200:
-                    elapsed_time = (i + 1) * 2
-                    logging.info(f"Model {model_id} started successfully at {vllm_base_url} after {elapsed_time}s.")
+                    elapsed_time = time.monotonic() - start_time
+                    logging.info(f"Model {model_id} started successfully at {vllm_base_url} after {elapsed_time:.1f}s.")
                     # Return runtime fields only; the caller owns the active_containers entry lifecycle.
                     return (ip_address, VLLM_PORT)
                 elif response.status_code != 503:
                     # 503 is expected during vLLM initialization; anything else is worth noting
-                    logging.warning(f"Unexpected health check status {response.status_code} for {model_id} (attempt {i+1})")
+                    logging.warning(f"Unexpected health check status {response.status_code} for {model_id} (attempt {attempt})")
             except httpx.RequestError:
-                # Log progress every 30 seconds (15 attempts * 2s)
-                if i > 0 and (i + 1) % 15 == 0:
-                    elapsed_time = (i + 1) * 2
-                    remaining_time = (1800 - i - 1) * 2
-                    elapsed_min = elapsed_time // 60
-                    remaining_min = remaining_time // 60
-                    logging.info(f"Model {model_id} still loading... ({elapsed_min}m {elapsed_time % 60}s elapsed, {remaining_min}m {remaining_time % 60}s remaining)")
-                elif i <= 5:
-                    logging.info(f"Waiting for model {model_id} to initialize... (attempt {i+1})")
-
-        elapsed_time = 1800 * 2
-        elapsed_min = elapsed_time // 60
+                now = time.monotonic()
+                if now >= next_progress_log:
+                    next_progress_log = now + 30
+                    elapsed_time = int(now - start_time)
+                    remaining_time = max(0, int(deadline - now))
+                    logging.info(f"Model {model_id} still loading... ({elapsed_time // 60}m {elapsed_time % 60}s elapsed, "
+                                 f"{remaining_time // 60}m {remaining_time % 60}s remaining)")
+                elif attempt <= 5:
+                    logging.info(f"Waiting for model {model_id} to initialize... (attempt {attempt})")
+
+        elapsed_min = int(time.monotonic() - start_time) // 60
         logging.error(f"Model {model_id} failed to start after {elapsed_min}m timeout.")
         # Raw removal, NOT stop_container: we are inside the caller's per-GPU startup gate and
         # stop_container acquires that same gate -> calling it here would self-deadlock. The
@@ -1472,6 +1722,20 @@ async def _settled_used(uuid: str, poll: float = 2.0, max_polls: int = 5) -> flo
         last = cur
     return last
 
+async def _poll_until_stable(uuid: str, interval: float = 0.5, stability_window: int = 3,
+                             tolerance_mib: float = 50.0, max_wait: float = 30.0) -> float:
+    """Poll a GPU's `used` MiB until it stops growing (placement.vram_settled over the last
+    `stability_window` samples) or `max_wait` seconds elapse; returns the peak observed. Replaces a
+    fixed sleep-and-sample schedule for the sole-occupant footprint delta: a model that is READY has
+    usually finished allocating, so this typically returns after a few probes."""
+    deadline = time.monotonic() + max_wait
+    samples = []
+    while True:
+        samples.append((await get_gpu_vram()).get(uuid, {}).get("used", 0.0))
+        if placement.vram_settled(samples, stability_window, tolerance_mib) or time.monotonic() >= deadline:
+            return max(samples)
+        await asyncio.sleep(interval)
+
 def _build_gpu_views(pool_gpus, gpus_snapshot):
     """Build (candidates, residents_by_gpu, blocked_gpus) for placement. MUST be called under
     state_lock (reads active_containers).
@@ -1488,6 +1752,8 @@ def _build_gpu_views(pool_gpus, gpus_snapshot):
         g = gpus_snapshot.get(guid)
         total = float(g["total"]) if g else 0.0
         on_gpu = [c for c in active_containers.values() if guid in c.gpu_uuids]
+        # active_containers is in access order, so `ready` is already LRU-first and the eviction
+        # sort in placement degenerates to a single linear pass.
         ready = [c for c in on_gpu if c.status == ContainerStatus.READY]
         loading = [c for c in on_gpu if c.status == ContainerStatus.LOADING]
         stopping = [c for c in on_gpu if c.status == ContainerStatus.STOPPING]
@@ -1606,11 +1872,11 @@ async def _start_and_finalize(entry, target_model_id, model_cfg, *, gpu_uuids, e
                     gpu_uuids=gpu_uuids, effective_tp=effective_tp, effective_util=effective_util)
         except BaseException:
             async with state_lock:
-                active_containers.pop(entry.container_name, None)  # drop LOADING on any failure/cancel
+                _untrack_container(entry.container_name)  # drop LOADING on any failure/cancel
             raise
         if not runtime:
             async with state_lock:
-                active_containers.pop(entry.container_name, None)
+                _untrack_container(entry.container_name)
             return None
 
         ip_address, port = runtime
@@ -1627,7 +1893,9 @@ async def _start_and_finalize(entry, target_model_id, model_cfg, *, gpu_uuids, e
                 entry.status = ContainerStatus.READY
                 entry.loaded_at = time.time()
                 entry.last_request_time = time.time()
+                active_containers.move_to_end(entry.container_name)
                 entry.vram_footprint = entry.reserved_mib  # seeded estimate; discovery may refine
+                _schedule_check(entry.container_name, _next_check_time(entry, entry.last_request_time))
         if stale:
             logging.warning(f"LOADING entry {entry.container_name} disappeared during start "
                             f"(reaped/evicted); stopping the orphaned container.")
@@ -1635,9 +1903,7 @@ async def _start_and_finalize(entry, target_model_id, model_cfg, *, gpu_uuids, e
             # profiling on these cards. entry.gpu_uuids is still valid on the popped entry object.
             try:
                 async with _gpu_startup_gate(entry.gpu_uuids):
-                    c = await run_in_executor(docker_client.containers.get, entry.container_name)
-                    await run_in_executor(c.stop)
-                    await run_in_executor(c.remove)
+                    await run_in_executor(_stop_and_remove_sync, entry.container_name)
             except (NotFound, APIError) as e:
                 logging.error(f"Could not clean up orphaned container {entry.container_name}: {e}")
             return None
@@ -1649,12 +1915,8 @@ async def _start_and_finalize(entry, target_model_id, model_cfg, *, gpu_uuids, e
             source = "compute-apps"
             # 2) Fallback: sole-occupant whole-GPU delta (only meaningful when run_discovery / alone).
             if measured is None and run_discovery and meas_gpu:
-                logging.info(f"compute-apps attribution unavailable; sampling GPU {meas_gpu} VRAM 3x over 45s...")
-                samples = []
-                for _ in range(3):
-                    await asyncio.sleep(15)
-                    samples.append((await get_gpu_vram()).get(meas_gpu, {}).get("used", 0.0))
-                delta = max(samples) - before_used
+                logging.info(f"compute-apps attribution unavailable; polling GPU {meas_gpu} VRAM until stable...")
+                delta = await _poll_until_stable(meas_gpu) - before_used
                 measured = delta if delta > 256 else None
                 source = "gpu-delta"
             # 3) Last resort: keep the reserved estimate (already seeded into vram_footprint).
@@ -1689,9 +1951,8 @@ async def _ensure_started(target_model_id, model_cfg):
     starts + finalizes outside the lock."""
     # Became READY since the fast-path check?
     async with state_lock:
-        ready = next((c for c in active_containers.values()
-                      if c.model_id == target_model_id and c.status == ContainerStatus.READY), None)
-    if ready is not None:
+        ready = containers_by_model.get(target_model_id)
+    if ready is not None and ready.status == ContainerStatus.READY:
         return ready
 
     # record shape: {per_gpu_mib, effective_tp, effective_util, measured_at, signature}. prior_tp is a
@@ -1718,15 +1979,14 @@ async def _ensure_started(target_model_id, model_cfg):
             await stop_container(n)
         gpu_uuids = list(pool_gpus) if pool_gpus else list(MANAGED_GPUS)
         async with state_lock:
-            slot_indices = {int(n.split('_')[-1]) for n in active_containers.keys()}
-            free_slot = next(i for i in range(len(slot_indices) + 1) if i not in slot_indices)
+            free_slot = _alloc_slot()
             entry = ContainerState(
                 model_id=target_model_id, container_name=f"{VLLM_CONTAINER_PREFIX}_{free_slot}",
                 status=ContainerStatus.LOADING, gpu_uuids=gpu_uuids, reserved_mib=0.0,
                 effective_tp=model_cfg.tensor_parallel_size, colocate=is_colocate,
                 always_on=model_cfg.always_on, inactivity_timeout=model_cfg.inactivity_timeout,
                 created_at=time.time())
-            active_containers[entry.container_name] = entry
+            _track_container(entry)
             loading_tasks[entry.container_name] = asyncio.current_task()  # owner-liveness handle (G2)
         return await _start_and_finalize(
             entry, target_model_id, model_cfg, gpu_uuids=gpu_uuids or None,
@@ -1832,15 +2092,14 @@ async def _ensure_started(target_model_id, model_cfg):
             effective_util = None
             reserve_amt = need_fn(chosen_gv)
 
-        slot_indices = {int(n.split('_')[-1]) for n in active_containers.keys()}
-        free_slot = next(i for i in range(len(slot_indices) + 1) if i not in slot_indices)
+        free_slot = _alloc_slot()
         entry = ContainerState(
             model_id=target_model_id, container_name=f"{VLLM_CONTAINER_PREFIX}_{free_slot}",
             status=ContainerStatus.LOADING, gpu_uuids=list(chosen_uuids), reserved_mib=reserve_amt,
             effective_tp=effective_tp, effective_util=effective_util or 0.0, colocate=is_colocate,
             always_on=model_cfg.always_on, inactivity_timeout=model_cfg.inactivity_timeout,
             created_at=time.time())
-        active_containers[entry.container_name] = entry
+        _track_container(entry)
         loading_tasks[entry.container_name] = asyncio.current_task()  # owner-liveness handle (G2)
         if is_colocate:
             placed_desc = 'colocate util=%.3f' % effective_util
@@ -1958,9 +2217,9 @@ async def proxy_request(request: Request):
 
         # Fast path: a READY container for this model already exists -> route to it.
         async with state_lock:
-            target_container = next((c for c in active_containers.values()
-                                     if c.model_id == target_model_id
-                                     and c.status == ContainerStatus.READY), None)
+            indexed = containers_by_model.get(target_model_id)
+            target_container = indexed if (indexed is not None
+                                           and indexed.status == ContainerStatus.READY) else None
 
         # Slow path: ensure a container is started (serialized per model via the start lock).
         if target_container is None:
@@ -1984,6 +2243,7 @@ async def proxy_request(request: Request):
                                     detail=f"Model {target_model_id} container became unavailable; retry.")
             target_container.last_request_time = time.time()
             target_container.active_requests += 1
+            active_containers.move_to_end(target_container.container_name)
         active_req_decremented = False
 
         query_string = str(request.url.query) if request.url.query else ""
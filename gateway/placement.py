@@ -242,6 +242,18 @@ def attribute_vram(compute_app_rows, host_pids, gpu_uuids) -> float:
     return total
 
 
+def vram_settled(samples, window=3, tolerance_mib=50.0) -> bool:
+    """True once the last `window` VRAM samples (MiB) lie within `tolerance_mib` of each other.
+
+    Used to stop a sole-occupant delta measurement as soon as a freshly-started model's usage has
+    stopped growing, instead of waiting a fixed interval. Fewer than `window` samples -> False.
+    """
+    if window <= 0 or len(samples) < window:
+        return False
+    recent = samples[-window:]
+    return (max(recent) - min(recent)) < tolerance_mib
+
+
 def estimate_need_mib(weights_mib, kv_mib_total, tp, overhead_factor, fixed_overhead_mib) -> float:
     """Per-card VRAM need (MiB) for a model in budget mode.
 
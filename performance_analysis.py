@@ -8,88 +8,374 @@ It provides empirical data to understand if these "improvements" are causing slo
 """
 
 import timeit
+import gc
 import logging
+import statistics
 import asyncio
-import threading
 import time
+import io
+import os
+import random
+import sys
+import textwrap
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
 from typing import Dict, List, Tuple
 
+from bench_utils import BENCH_NICE, isolate_cpu
+
+try:
+    from numba import njit  # optional: only used for the JIT baseline section
+except ImportError:
+    njit = None
+
 # Setup logging similar to the gateway
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+BULK_BATCH = 1000  # statements per timed call for the sub-0.1 μs retry/variable/pool cases
+KERNEL_ITERATIONS = 100_000  # input length of the counter/retry kernels in analyze_numba_baseline
+ENABLED_LOG_NUMBER = 1_000  # fixed loop count for rows that write a DEBUG line to stderr per iteration
+CV_THRESHOLD = 0.05  # stdev/mean across rounds above which a result is flagged UNRELIABLE
+
+
+@contextmanager
+def _gc_paused():
+    """Collect garbage up front, then keep the collector off for the timed region."""
+    gc.collect()
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _mock_request_py(outcome: int) -> int:
+    return outcome
+
+
+# The kernels read their work from a runtime array and return a value that depends on every
+# iteration, so neither CPython nor LLVM can reduce the loop to a closed form.
+def _counter_kernel_py(deltas):
+    depth = 0
+    for d in deltas:
+        depth += d
+        if depth < 0:
+            depth = 0
+    return depth
+
+
+def _retry_kernel_py(outcomes):
+    attempts = 0
+    for o in outcomes:
+        for attempt in range(3):
+            if _mock_request_py((o >> attempt) & 1):
+                attempts += attempt + 1
+                break
+    return attempts
+
+
+if njit is not None:
+    import numpy as np  # numba depends on numpy, so it is present whenever njit is
+
+    # Same kernels compiled to native code; cache=True keeps the compiled artifacts across runs.
+    _mock_request_jit = njit(cache=True)(_mock_request_py)
+
+    @njit(cache=True)
+    def _counter_kernel_jit(deltas):
+        depth = 0
+        for i in range(deltas.shape[0]):
+            depth += deltas[i]
+            if depth < 0:
+                depth = 0
+        return depth
+
+    @njit(cache=True)
+    def _retry_kernel_jit(outcomes):
+        attempts = 0
+        for i in range(outcomes.shape[0]):
+            o = outcomes[i]
+            for attempt in range(3):
+                if _mock_request_jit((o >> attempt) & 1):
+                    attempts += attempt + 1
+                    break
+        return attempts
+
+
+# Per-section namespaces of PerformanceAnalyzer.results; a BenchKey's value is "<namespace>.<id>".
+RESULT_NAMESPACES = ("fmt", "log", "lock", "retry", "var", "pool", "async", "jit")
+
+
+class BenchKey(str, Enum):
+    """Short, typo-proof IDs for every measurement in PerformanceAnalyzer.results."""
+
+    @property
+    def ns(self) -> str:
+        """The results namespace this key is stored under."""
+        return self.value.partition(".")[0]
+
+    SIMPLE_STRING = "fmt.simple_string"
+    SINGLE_FSTRING = "fmt.single_fstring"
+    COMPLEX_FSTRING = "fmt.complex_fstring"
+    STRING_CONCAT = "fmt.string_concat"
+    BOUND_STR_FORMAT = "fmt.bound_str_format"
+    STRING_TEMPLATE = "fmt.string_template"
+    DEBUG_FSTRING_ENABLED = "log.debug_fstring_enabled"
+    DEBUG_FSTRING_DISABLED = "log.debug_fstring_disabled"
+    DEBUG_LAZY_ENABLED = "log.debug_lazy_enabled"
+    DEBUG_LAZY_DISABLED = "log.debug_lazy_disabled"
+    GUARD_FSTRING = "log.guard_fstring"
+    GUARD_LAZY = "log.guard_lazy"
+    GUARD_ISENABLED = "log.guard_isenabled"
+    GUARD_CACHED_FLAG = "log.guard_cached_flag"
+    LOCK_BARE = "lock.lock_bare"
+    LOCK_LOG_DISABLED = "lock.lock_log_disabled"
+    LOCK_LOG_ENABLED = "lock.lock_log_enabled"
+    LOCK_LOG_OUTSIDE = "lock.lock_log_outside"
+    LOCK_SNAPSHOT = "lock.lock_snapshot"
+    DIRECT_CALL = "retry.direct_call"
+    RETRY_LOOP = "retry.retry_loop"
+    RETRY_UNROLLED = "retry.retry_unrolled"
+    BOOL_ASSIGN = "var.bool_assign"
+    COUNTER_OPS = "var.counter_ops"
+    POOL_LOOKUP_100 = "pool.pool_lookup_100"
+    POOL_LOOKUP_150 = "pool.pool_lookup_150"
+    ASYNC_LOCK = "async.async_lock"
+    ASYNC_SLEEP = "async.async_sleep"
+    COUNTER_KERNEL_PY = "jit.counter_kernel_py"
+    COUNTER_KERNEL_JIT = "jit.counter_kernel_jit"
+    RETRY_KERNEL_PY = "jit.retry_kernel_py"
+    RETRY_KERNEL_JIT = "jit.retry_kernel_jit"
+
+
+@dataclass(slots=True)
+class BenchResult:
+    """One measurement: min_us is the overhead-corrected minimum and is what the report uses."""
+    name: str
+    min_us: float
+    raw_us: float
+    mean_us: float
+    std_us: float
+    n: int  # rounds (timeit repeat)
+    iters: int  # iterations per round
+    cv: float = 0.0  # std_us / mean_us
+    reliable: bool = True  # False when cv > CV_THRESHOLD
+
 
 class PerformanceAnalyzer:
     """Measures performance impact of gateway changes."""
 
-    def __init__(self):
-        self.results = {}
+    def __init__(self, cpu: "int | None" = None, timing: bool = True):
+        """timing=False builds a report-only analyzer (merging results, the summary): it neither
+        pins nor changes priority, and skips the overhead estimate."""
+        self.priority_raised = isolate_cpu(cpu) if timing else False
+        # namespace -> {key: result}: each analyze_* section writes only its own namespace(s)
+        self.results: Dict[str, Dict[BenchKey, BenchResult]] = {ns: {} for ns in RESULT_NAMESPACES}
+        self._buf = io.StringIO()  # report text accumulates here; flush_output() writes it in one call
         self.model_name = "test-model"
         self.target_model_id = "org/test-model-id"
         self.depth = 42
         self.max_size = 200
-
-    def benchmark(self, name: str, code: str, setup: str = "", number: int = 100000) -> float:
-        """Run a microbenchmark and return time per iteration in microseconds."""
-        total_time = timeit.timeit(code, setup=setup, number=number)
-        time_per_op = (total_time / number) * 1_000_000  # Convert to microseconds
-        self.results[name] = time_per_op
-        return time_per_op
+        self._overhead_us = 0.0
+        if timing:
+            self._overhead_us = self.estimate_overhead()
+        self._batch_overhead_us = {1: self._overhead_us}  # batch size -> empty-loop overhead (μs/op)
+
+    def _p(self, *args):
+        """print() into the report buffer instead of stdout."""
+        print(*args, file=self._buf)
+
+    def flush_output(self) -> str:
+        """Return the buffered report text and start a fresh buffer."""
+        text = self._buf.getvalue()
+        self._buf = io.StringIO()
+        return text
+
+    def estimate_overhead(self, repeat: int = 7, batch: int = 1) -> float:
+        """Time an empty statement through the same harness as benchmark() (μs per iteration).
+
+        This is the cost of timeit's own loop; at the 10-100 ns scale of a dict lookup it is a large
+        share of the raw figure, so benchmark() subtracts it from every result."""
+        timer, code_batch = self._make_timer("pass", "", None, batch)
+        number, _ = timer.autorange()
+        with _gc_paused():
+            times = timer.repeat(repeat=repeat, number=number)
+        return min(times) / (number * code_batch) * 1_000_000
+
+    @staticmethod
+    def _make_timer(code: str, setup: str, globals: "dict | None", batch: int) -> "Tuple[timeit.Timer, int]":
+        """Build the Timer for `code`; with batch > 1 the statement runs `batch` times per timed call.
+
+        The batched form defines _bulk() at the end of setup, looping over the statement, and times
+        `_bulk()`, so each timed call does `batch` real operations. The statement must not rebind
+        names defined in setup (they are closure variables inside _bulk)."""
+        if batch > 1:
+            body = textwrap.indent(textwrap.dedent(code).strip("\n"), " " * 8)
+            setup = f"{setup}\ndef _bulk():\n    for _ in range({batch}):\n{body}\n"
+            code = "_bulk()"
+        return timeit.Timer(code, setup=setup, globals=globals), batch
+
+    def benchmark(self, key: BenchKey, code: str, setup: str = "", number: "int | None" = None, repeat: int = 7,
+                  globals: "dict | None" = None, batch: int = 1) -> float:
+        """Run a microbenchmark and return time per iteration in microseconds.
+
+        Runs `repeat` rounds of `number` iterations and keeps the fastest round: noise (GC, scheduler)
+        can only add time, so the minimum is the best estimate of the real cost. The stdev across
+        rounds is kept on the BenchResult so format_result() can show how trustworthy it is.
+
+        The returned value (BenchResult.min_us) has the empty-loop overhead (estimate_overhead)
+        subtracted; the uncorrected figure is kept as raw_us.
+
+        `number` defaults to Timer.autorange(), which scales the loop count until one round takes
+        >= 0.2 s, so cheap and expensive statements get the same measurement budget. Pass an explicit
+        number where a fixed count is needed: for determinism, or for the DEBUG-enabled rows
+        (ENABLED_LOG_NUMBER), where autorange would size each round to ~0.2 s of stderr writes.
+        `globals` is passed through to timeit.Timer (e.g. to hand the statement a sink object it
+        must write into).
+
+        `batch` > 1 runs the statement in bulk (see _make_timer) and divides by it, with the overhead
+        of an equally batched empty loop subtracted instead."""
+        timer, batch = self._make_timer(code, setup, globals, batch)
+        if number is None:
+            number, _ = timer.autorange()
+        with _gc_paused():
+            times = timer.repeat(repeat=repeat, number=number)
+        per_op = [t / (number * batch) * 1_000_000 for t in times]  # Convert to microseconds
+        if batch not in self._batch_overhead_us:
+            self._batch_overhead_us[batch] = self.estimate_overhead(batch=batch)
+        return self._record(key, per_op, number * batch, self._batch_overhead_us[batch])
+
+    def _record(self, key: BenchKey, per_op: List[float], iters: int, overhead_us: float = 0.0) -> float:
+        """Store a BenchResult for per-round μs/op figures under `key`; returns its min_us."""
+        raw = min(per_op)
+        mean = statistics.fmean(per_op)
+        std = statistics.stdev(per_op) if len(per_op) > 1 else 0.0
+        cv = std / mean if mean else 0.0
+        result = BenchResult(
+            name=key.value,
+            min_us=max(0.0, raw - overhead_us),
+            raw_us=raw,
+            mean_us=mean,
+            std_us=std,
+            n=len(per_op),
+            iters=iters,
+            cv=cv,
+            reliable=cv <= CV_THRESHOLD,
+        )
+        self.results[key.ns][key] = result
+        return result.min_us
+
+    def _us(self, key: BenchKey) -> float:
+        """min_us of a recorded result. Raises KeyError for a missing one instead of reporting 0."""
+        return self.results[key.ns][key].min_us
+
+    def _flag(self, key: BenchKey) -> str:
+        """' [UNRELIABLE cv=..]' for a result whose rounds disagree by more than CV_THRESHOLD."""
+        result = self.results[key.ns][key]
+        return "" if result.reliable else f" [UNRELIABLE cv={result.cv:.1%}]"
+
+    def _fmt_us(self, key: BenchKey, precision: int = 2) -> str:
+        """A result for the summary, e.g. '0.21 μs', flagged if unreliable."""
+        return f"{self._us(key):.{precision}f} μs{self._flag(key)}"
+
+    def _fmt_delta(self, key: BenchKey, baseline: BenchKey, precision: int = 2) -> str:
+        """key - baseline for the summary. Refuses to compute it when BOTH sides are unreliable,
+        since the difference of two noisy figures says nothing."""
+        if not self.results[key.ns][key].reliable and not self.results[baseline.ns][baseline].reliable:
+            return "n/a (both measurements UNRELIABLE)"
+        return f"{self._us(key) - self._us(baseline):.{precision}f} μs{self._flag(key)}{self._flag(baseline)}"
+
+    def format_result(self, key: BenchKey) -> str:
+        """Format a benchmark result as 'min ± stdev μs (cv=...)', flagged if unreliable."""
+        result = self.results[key.ns][key]
+        suffix = "" if result.reliable else " [UNRELIABLE]"
+        return f"{result.min_us:.3f} ± {result.std_us:.3f} μs (cv={result.cv:.2%}){suffix}"
 
     def analyze_string_formatting(self):
         """Measure string formatting overhead for log messages."""
-        print("\n" + "="*80)
-        print("1. STRING FORMATTING OVERHEAD")
-        print("="*80)
+        self._p("\n" + "="*80)
+        self._p("1. STRING FORMATTING OVERHEAD")
+        self._p("="*80)
+
+        # Every statement stores its result into a caller-owned sink, so a bare constant expression
+        # can't be folded/dropped by the compiler and all variants pay the same store cost.
+        sink = {"_sink": [None]}
 
         # Simple string
         time_simple = self.benchmark(
-            "Simple string",
-            '"Request queued"',
-            number=1_000_000
+            BenchKey.SIMPLE_STRING,
+            '_sink[0] = "Request queued"',
+            globals=sink
         )
-        print(f"Simple string literal: {time_simple:.3f} μs")
+        self._p(f"Simple string literal: {self.format_result(BenchKey.SIMPLE_STRING)}")
 
         # Single f-string variable
-        time_single = self.benchmark(
-            "Single variable f-string",
-            'f"Request queued for {model_name}"',
+        self.benchmark(
+            BenchKey.SINGLE_FSTRING,
+            '_sink[0] = f"Request queued for {model_name}"',
             setup='model_name = "test-model"',
-            number=1_000_000
+            globals=sink
         )
-        print(f"Single variable f-string: {time_single:.3f} μs")
+        self._p(f"Single variable f-string: {self.format_result(BenchKey.SINGLE_FSTRING)}")
 
         # Complex f-string (like queue logging)
         time_complex = self.benchmark(
-            "Complex queue log f-string",
-            'f"Request queued for {model_name} ({target_model_id}). Queue depth: {depth}/{max_size}"',
+            BenchKey.COMPLEX_FSTRING,
+            '_sink[0] = f"Request queued for {model_name} ({target_model_id}). Queue depth: {depth}/{max_size}"',
             setup='model_name = "test-model"; target_model_id = "org/test-model-id"; depth = 42; max_size = 200',
-            number=1_000_000
+            globals=sink
         )
-        print(f"Complex f-string (queue log): {time_complex:.3f} μs")
+        self._p(f"Complex f-string (queue log): {self.format_result(BenchKey.COMPLEX_FSTRING)}")
 
         # String concatenation (alternative)
-        time_concat = self.benchmark(
-            "String concatenation",
-            '"Request queued for " + model_name + " (" + target_model_id + "). Queue depth: " + str(depth) + "/" + str(max_size)',
+        self.benchmark(
+            BenchKey.STRING_CONCAT,
+            '_sink[0] = "Request queued for " + model_name + " (" + target_model_id + "). Queue depth: " + str(depth) + "/" + str(max_size)',
             setup='model_name = "test-model"; target_model_id = "org/test-model-id"; depth = 42; max_size = 200',
-            number=1_000_000
+            globals=sink
+        )
+        self._p(f"String concatenation (alternative): {self.format_result(BenchKey.STRING_CONCAT)}")
+
+        # Pre-bound str.format of a fixed layout: the template is parsed by the C formatter at call
+        # time, but the bound method itself is built once in setup
+        setup_vars = 'model_name = "test-model"; target_model_id = "org/test-model-id"; depth = 42; max_size = 200'
+        time_format = self.benchmark(
+            BenchKey.BOUND_STR_FORMAT,
+            '_sink[0] = T(m=model_name, t=target_model_id, d=depth, ms=max_size)',
+            setup=setup_vars + '; T = "Request queued for {m} ({t}). Queue depth: {d}/{ms}".format',
+            globals=sink
         )
-        print(f"String concatenation (alternative): {time_concat:.3f} μs")
+        self._p(f"Bound str.format template: {self.format_result(BenchKey.BOUND_STR_FORMAT)}")
+
+        # string.Template with $-substitution
+        time_template = self.benchmark(
+            BenchKey.STRING_TEMPLATE,
+            '_sink[0] = T.substitute(m=model_name, t=target_model_id, d=depth, ms=max_size)',
+            setup=setup_vars + '; import string; T = string.Template("Request queued for $m ($t). Queue depth: $d/$ms")',
+            globals=sink
+        )
+        self._p(f"string.Template.substitute: {self.format_result(BenchKey.STRING_TEMPLATE)}")
 
-        print(f"\nOverhead vs simple string: {time_complex - time_simple:.3f} μs")
-        print(f"Overhead per log message: ~{time_complex:.2f} μs")
+        self._p(f"\nOverhead vs simple string: {time_complex - time_simple:.3f} μs")
+        self._p(f"Overhead per log message: ~{time_complex:.2f} μs")
+        self._p(f"Bound str.format vs f-string: {time_format - time_complex:+.3f} μs; "
+                f"string.Template vs f-string: {time_template - time_complex:+.3f} μs")
 
     def analyze_logging_overhead(self):
         """Measure logging.debug() overhead with different log levels."""
-        print("\n" + "="*80)
-        print("2. LOGGING.DEBUG() OVERHEAD")
-        print("="*80)
+        self._p("\n" + "="*80)
+        self._p("2. LOGGING.DEBUG() OVERHEAD")
+        self._p("="*80)
 
         # Test with DEBUG level (logging enabled)
         setup_debug = """
 import logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger()
+logger.setLevel(logging.DEBUG)
 model_name = "test-model"
 target_model_id = "org/test-model-id"
 depth = 42
@@ -97,18 +383,18 @@ max_size = 200
 """
 
         time_debug_enabled = self.benchmark(
-            "logging.debug() - DEBUG level",
+            BenchKey.DEBUG_FSTRING_ENABLED,
             'logger.debug(f"Request queued for {model_name} ({target_model_id}). Queue depth: {depth}/{max_size}")',
             setup=setup_debug,
-            number=10_000  # Fewer iterations because logging is slow
+            number=ENABLED_LOG_NUMBER
         )
-        print(f"logging.debug() with DEBUG level: {time_debug_enabled:.3f} μs")
+        self._p(f"logging.debug() with DEBUG level: {self.format_result(BenchKey.DEBUG_FSTRING_ENABLED)}")
 
         # Test with INFO level (logging disabled - early return)
         setup_info = """
 import logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger()
+logger.setLevel(logging.INFO)
 model_name = "test-model"
 target_model_id = "org/test-model-id"
 depth = 42
@@ -116,81 +402,180 @@ max_size = 200
 """
 
         time_debug_disabled = self.benchmark(
-            "logging.debug() - INFO level",
+            BenchKey.DEBUG_FSTRING_DISABLED,
             'logger.debug(f"Request queued for {model_name} ({target_model_id}). Queue depth: {depth}/{max_size}")',
-            setup=setup_info,
-            number=100_000  # Can do more iterations when disabled
+            setup=setup_info
         )
-        print(f"logging.debug() with INFO level (disabled): {time_debug_disabled:.3f} μs")
+        self._p(f"logging.debug() with INFO level (disabled): {self.format_result(BenchKey.DEBUG_FSTRING_DISABLED)}")
 
-        print(f"\nCritical finding:")
-        print(f"  - DEBUG enabled: {time_debug_enabled:.2f} μs per call")
-        print(f"  - DEBUG disabled: {time_debug_disabled:.2f} μs per call")
-        print(f"  - Difference: {time_debug_enabled - time_debug_disabled:.2f} μs")
-        print(f"\nNote: Python's logging module still evaluates f-strings even when disabled!")
-        print(f"This is because f-strings are evaluated BEFORE being passed to logging.debug().")
+        # Same calls with lazy %-style args: formatting is deferred to LogRecord.getMessage()
+        self.benchmark(
+            BenchKey.DEBUG_LAZY_ENABLED,
+            'logger.debug("Request queued for %s (%s). Queue depth: %s/%s", model_name, target_model_id, depth, max_size)',
+            setup=setup_debug,
+            number=ENABLED_LOG_NUMBER
+        )
+        self._p(f"logger.debug %s-style with DEBUG level: {self.format_result(BenchKey.DEBUG_LAZY_ENABLED)}")
+
+        time_lazy_disabled = self.benchmark(
+            BenchKey.DEBUG_LAZY_DISABLED,
+            'logger.debug("Request queued for %s (%s). Queue depth: %s/%s", model_name, target_model_id, depth, max_size)',
+            setup=setup_info
+        )
+        self._p(f"logger.debug %s-style with INFO level (disabled): {self.format_result(BenchKey.DEBUG_LAZY_DISABLED)}")
+
+        self._p(f"\nCritical finding:")
+        self._p(f"  - DEBUG enabled: {time_debug_enabled:.2f} μs per call")
+        self._p(f"  - DEBUG disabled: {time_debug_disabled:.2f} μs per call")
+        self._p(f"  - Difference: {time_debug_enabled - time_debug_disabled:.2f} μs")
+        self._p(f"  - DEBUG disabled, %s-style: {time_lazy_disabled:.2f} μs per call "
+                f"(saves {time_debug_disabled - time_lazy_disabled:.2f} μs)")
+        self._p(f"\nNote: Python's logging module still evaluates f-strings even when disabled!")
+        self._p(f"This is because f-strings are evaluated BEFORE being passed to logging.debug().")
+        self._p(f"%s-style args are only formatted if a handler actually emits the record.")
+
+    def analyze_isenabled_guard(self):
+        """Compare ways of keeping a disabled debug log off the hot path."""
+        self._p("\n" + "="*80)
+        self._p("2b. ISENABLEDFOR GUARD (DEBUG DISABLED)")
+        self._p("="*80)
+
+        # Dedicated logger pinned to INFO so the root logger's level can't re-enable it
+        setup_guard = """
+import logging
+logger = logging.getLogger("perf_analysis.guard")
+logger.setLevel(logging.INFO)
+_is_debug = logger.isEnabledFor(logging.DEBUG)  # cached once when the level is static
+model_name = "test-model"
+target_model_id = "org/test-model-id"
+depth = 42
+max_size = 200
+"""
+
+        time_fstring = self.benchmark(
+            BenchKey.GUARD_FSTRING,
+            'logger.debug(f"Request queued for {model_name} ({target_model_id}). Queue depth: {depth}/{max_size}")',
+            setup=setup_guard
+        )
+        self._p(f"Bare f-string logger.debug: {self.format_result(BenchKey.GUARD_FSTRING)}")
+
+        time_lazy = self.benchmark(
+            BenchKey.GUARD_LAZY,
+            'logger.debug("Request queued for %s (%s). Queue depth: %s/%s", model_name, target_model_id, depth, max_size)',
+            setup=setup_guard
+        )
+        self._p(f"%s-style logger.debug: {self.format_result(BenchKey.GUARD_LAZY)}")
+
+        time_guarded = self.benchmark(
+            BenchKey.GUARD_ISENABLED,
+            'if logger.isEnabledFor(logging.DEBUG): logger.debug(f"Request queued for {model_name} ({target_model_id}). Queue depth: {depth}/{max_size}")',
+            setup=setup_guard
+        )
+        self._p(f"if logger.isEnabledFor(DEBUG): logger.debug(f...): {self.format_result(BenchKey.GUARD_ISENABLED)}")
+
+        time_cached = self.benchmark(
+            BenchKey.GUARD_CACHED_FLAG,
+            'if _is_debug: logger.debug(f"Request queued for {model_name} ({target_model_id}). Queue depth: {depth}/{max_size}")',
+            setup=setup_guard
+        )
+        self._p(f"if _is_debug: logger.debug(f...): {self.format_result(BenchKey.GUARD_CACHED_FLAG)}")
+
+        self._p(f"\nSavings vs bare f-string:")
+        self._p(f"  - %s-style: {time_fstring - time_lazy:.3f} μs")
+        self._p(f"  - isEnabledFor guard: {time_fstring - time_guarded:.3f} μs")
+        self._p(f"  - cached flag: {time_fstring - time_cached:.3f} μs")
 
     def analyze_lock_hold_time(self):
         """Measure how long locks are held with and without logging."""
-        print("\n" + "="*80)
-        print("3. LOCK HOLD TIME ANALYSIS")
-        print("="*80)
-
-        # Simulate lock operations
-        lock = threading.Lock()
-        counter = 0
+        self._p("\n" + "="*80)
+        self._p("3. LOCK HOLD TIME ANALYSIS")
+        self._p("="*80)
+
+        # Simulate lock operations. The level is switched with setLevel on the root logger (an int
+        # store) rather than basicConfig(force=True), which would tear down and rebuild the handler
+        # between timed regions; log_debug is bound once so the loop doesn't look it up per call.
+        setup_lock = """
+import threading
+lock = threading.Lock()
+counter = 0
+"""
+        setup_logging = setup_lock + """
+import logging
+root = logging.getLogger()
+root.setLevel(logging.INFO)  # DEBUG disabled
+log_debug = root.debug
+model_name = "test-model"
+target_model_id = "org/test-model-id"
+max_size = 200
+"""
+        setup_logging_debug = setup_logging + """
+root.setLevel(logging.DEBUG)  # DEBUG enabled
+"""
+        stmt_log_inside = """
+with lock:
+    counter += 1
+    log_debug("Request queued for %s (%s). Queue depth: %s/%s", model_name, target_model_id, counter, max_size)
+"""
 
         # Without logging
-        iterations = 100_000
-        start = time.perf_counter()
-        for _ in range(iterations):
-            with lock:
-                counter += 1
-        time_without_logging = (time.perf_counter() - start) / iterations * 1_000_000
+        time_without_logging = self.benchmark(
+            BenchKey.LOCK_BARE,
+            "with lock:\n    counter += 1",
+            setup=setup_lock
+        )
 
         # With logging (but disabled)
-        counter = 0
-        model_name = "test-model"
-        target_model_id = "org/test-model-id"
-        max_size = 200
-        logging.basicConfig(level=logging.INFO)  # DEBUG disabled
-
-        start = time.perf_counter()
-        for i in range(iterations):
-            with lock:
-                counter += 1
-                logging.debug(f"Request queued for {model_name} ({target_model_id}). Queue depth: {counter}/{max_size}")
-        time_with_logging_disabled = (time.perf_counter() - start) / iterations * 1_000_000
-
-        # With logging (enabled) - fewer iterations
-        counter = 0
-        logging.basicConfig(level=logging.DEBUG, force=True)  # DEBUG enabled
-        iterations_debug = 10_000
-
-        start = time.perf_counter()
-        for i in range(iterations_debug):
-            with lock:
-                counter += 1
-                logging.debug(f"Request queued for {model_name} ({target_model_id}). Queue depth: {counter}/{max_size}")
-        time_with_logging_enabled = (time.perf_counter() - start) / iterations_debug * 1_000_000
-
-        print(f"Lock hold time without logging: {time_without_logging:.3f} μs")
-        print(f"Lock hold time with logging (disabled): {time_with_logging_disabled:.3f} μs")
-        print(f"Lock hold time with logging (enabled): {time_with_logging_enabled:.3f} μs")
-
-        print(f"\nLock contention impact:")
-        print(f"  - Overhead with DEBUG disabled: +{time_with_logging_disabled - time_without_logging:.2f} μs")
-        print(f"  - Overhead with DEBUG enabled: +{time_with_logging_enabled - time_without_logging:.2f} μs")
-
-        self.results["Lock without logging"] = time_without_logging
-        self.results["Lock with logging (disabled)"] = time_with_logging_disabled
-        self.results["Lock with logging (enabled)"] = time_with_logging_enabled
+        time_with_logging_disabled = self.benchmark(
+            BenchKey.LOCK_LOG_DISABLED,
+            stmt_log_inside,
+            setup=setup_logging
+        )
+
+        # With logging (enabled)
+        time_with_logging_enabled = self.benchmark(
+            BenchKey.LOCK_LOG_ENABLED,
+            stmt_log_inside,
+            setup=setup_logging_debug,
+            number=ENABLED_LOG_NUMBER
+        )
+
+        # With logging (enabled) but moved after release: only the counter snapshot is taken
+        # inside the lock. That critical section is timed on its own so the held time is measured
+        time_snapshot = self.benchmark(
+            BenchKey.LOCK_SNAPSHOT,
+            "with lock:\n    counter += 1\n    snapshot = counter",
+            setup=setup_lock
+        )
+        time_with_logging_outside_lock = self.benchmark(
+            BenchKey.LOCK_LOG_OUTSIDE,
+            """
+with lock:
+    counter += 1
+    snapshot = counter
+log_debug("Request queued for %s (%s). Queue depth: %s/%s", model_name, target_model_id, snapshot, max_size)
+""",
+            setup=setup_logging_debug,
+            number=ENABLED_LOG_NUMBER
+        )
+
+        self._p(f"Lock hold time without logging: {self.format_result(BenchKey.LOCK_BARE)}")
+        self._p(f"Lock hold time with logging (disabled): {self.format_result(BenchKey.LOCK_LOG_DISABLED)}")
+        self._p(f"Lock hold time with logging (enabled): {self.format_result(BenchKey.LOCK_LOG_ENABLED)}")
+        self._p(f"Lock hold time with logging after release: {self.format_result(BenchKey.LOCK_SNAPSHOT)}")
+        self._p(f"Loop time with logging (enabled) outside the lock: {self.format_result(BenchKey.LOCK_LOG_OUTSIDE)} "
+                f"(lock held ~{time_snapshot:.3f} μs of it)")
+
+        self._p(f"\nLock contention impact:")
+        self._p(f"  - Overhead with DEBUG disabled: +{time_with_logging_disabled - time_without_logging:.2f} μs")
+        self._p(f"  - Overhead with DEBUG enabled: +{time_with_logging_enabled - time_without_logging:.2f} μs")
+        self._p(f"  - Overhead with DEBUG enabled, logged after release: {time_snapshot - time_without_logging:+.2f} μs held "
+                f"(the {time_with_logging_outside_lock - time_snapshot:.2f} μs of logging runs unlocked)")
 
     def analyze_retry_loop_overhead(self):
         """Measure overhead of retry loop wrapper on SUCCESS path."""
-        print("\n" + "="*80)
-        print("4. RETRY LOOP OVERHEAD (SUCCESS PATH)")
-        print("="*80)
+        self._p("\n" + "="*80)
+        self._p("4. RETRY LOOP OVERHEAD (SUCCESS PATH)")
+        self._p("="*80)
 
         # Direct function call (before)
         setup = """
@@ -198,12 +583,12 @@ def mock_request():
     return "success"
 """
         time_direct = self.benchmark(
-            "Direct call",
+            BenchKey.DIRECT_CALL,
             'mock_request()',
             setup=setup,
-            number=1_000_000
+            batch=BULK_BATCH
         )
-        print(f"Direct function call: {time_direct:.3f} μs")
+        self._p(f"Direct function call: {self.format_result(BenchKey.DIRECT_CALL)}")
 
         # With retry loop (after)
         setup_retry = """
@@ -224,290 +609,450 @@ def call_with_retry():
                 raise
 """
         time_retry = self.benchmark(
-            "With retry loop",
+            BenchKey.RETRY_LOOP,
             'call_with_retry()',
             setup=setup_retry,
-            number=1_000_000
+            batch=BULK_BATCH
         )
-        print(f"Function call with retry loop: {time_retry:.3f} μs")
+        self._p(f"Function call with retry loop: {self.format_result(BenchKey.RETRY_LOOP)}")
+
+        # Same retry semantics, but the first attempt is straight-line code, the request callable and
+        # the retry schedule are bound as defaults (LOAD_FAST), and no range object is built per call
+        setup_unrolled = """
+def mock_request():
+    return "success"
 
-        print(f"\nRetry loop overhead on SUCCESS: +{time_retry - time_direct:.3f} μs")
-        print(f"This overhead is paid on EVERY request (even when no retry is needed)")
+_attempts = (0, 1, 2)
+_retries = _attempts[1:]
+
+def call_with_retry_unrolled(_req=mock_request, _retries=_retries, _last=_attempts[-1]):
+    try:
+        return _req()
+    except Exception:
+        if not _retries:
+            raise
+    for retry_attempt in _retries:
+        pass  # Would sleep here
+        try:
+            return _req()
+        except Exception:
+            if retry_attempt == _last:
+                raise
+"""
+        time_unrolled = self.benchmark(
+            BenchKey.RETRY_UNROLLED,
+            'call_with_retry_unrolled()',
+            setup=setup_unrolled,
+            batch=BULK_BATCH
+        )
+        self._p(f"Function call with retry-unrolled: {self.format_result(BenchKey.RETRY_UNROLLED)}")
+
+        self._p(f"\nRetry loop overhead on SUCCESS: +{time_retry - time_direct:.3f} μs")
+        self._p(f"Retry-unrolled overhead on SUCCESS: +{time_unrolled - time_direct:.3f} μs")
+        self._p(f"This overhead is paid on EVERY request (even when no retry is needed)")
 
     def analyze_variable_overhead(self):
         """Measure overhead of variable operations."""
-        print("\n" + "="*80)
-        print("5. VARIABLE OPERATION OVERHEAD")
-        print("="*80)
+        self._p("\n" + "="*80)
+        self._p("5. VARIABLE OPERATION OVERHEAD")
+        self._p("="*80)
 
         # Boolean variable assignment
         time_bool = self.benchmark(
-            "Boolean assignment",
+            BenchKey.BOOL_ASSIGN,
             'counter_decremented = False; counter_decremented = True',
-            number=1_000_000
+            batch=BULK_BATCH
         )
-        print(f"Boolean variable operations: {time_bool:.3f} μs")
+        self._p(f"Boolean variable operations: {self.format_result(BenchKey.BOOL_ASSIGN)}")
 
         # Integer counter operations
-        time_counter = self.benchmark(
-            "Counter operations",
+        self.benchmark(
+            BenchKey.COUNTER_OPS,
             'counter = 0; counter += 1; counter = max(0, counter - 1)',
-            number=1_000_000
+            batch=BULK_BATCH
         )
-        print(f"Counter increment/decrement: {time_counter:.3f} μs")
+        self._p(f"Counter increment/decrement: {self.format_result(BenchKey.COUNTER_OPS)}")
 
-        print(f"\nVariable overhead: NEGLIGIBLE (~{time_bool:.3f} μs)")
+        self._p(f"\nVariable overhead: NEGLIGIBLE (~{time_bool:.3f} μs)")
 
     def analyze_connection_pool_impact(self):
         """Analyze connection pool size impact."""
-        print("\n" + "="*80)
-        print("6. CONNECTION POOL SIZE IMPACT")
-        print("="*80)
+        self._p("\n" + "="*80)
+        self._p("6. CONNECTION POOL SIZE IMPACT")
+        self._p("="*80)
 
         # Dict lookup (connection pool uses dict internally)
         setup_small = """
 pool = {i: f"connection_{i}" for i in range(100)}
 """
         time_small = self.benchmark(
-            "Dict lookup (100 items)",
+            BenchKey.POOL_LOOKUP_100,
             'pool.get(50)',
             setup=setup_small,
-            number=1_000_000
+            batch=BULK_BATCH
         )
 
         setup_large = """
 pool = {i: f"connection_{i}" for i in range(150)}
 """
         time_large = self.benchmark(
-            "Dict lookup (150 items)",
+            BenchKey.POOL_LOOKUP_150,
             'pool.get(75)',
             setup=setup_large,
-            number=1_000_000
+            batch=BULK_BATCH
         )
 
-        print(f"Connection pool lookup (100 connections): {time_small:.3f} μs")
-        print(f"Connection pool lookup (150 connections): {time_large:.3f} μs")
-        print(f"Difference: {time_large - time_small:.3f} μs")
-
-        print(f"\nConnection pool size impact: NEGLIGIBLE (O(1) dict lookup)")
-        print(f"Memory impact: ~50 connections * 16 KB = 800 KB additional memory")
+        self._p(f"Connection pool lookup (100 connections): {self.format_result(BenchKey.POOL_LOOKUP_100)}")
+        self._p(f"Connection pool lookup (150 connections): {self.format_result(BenchKey.POOL_LOOKUP_150)}")
+        self._p(f"Difference: {time_large - time_small:.3f} μs")
+
+        self._p(f"\nConnection pool size impact: NEGLIGIBLE (O(1) dict lookup)")
+        self._p(f"Memory impact: ~50 connections * 16 KB = 800 KB additional memory")
+
+    def analyze_numba_baseline(self):
+        """Compare the counter/retry kernels in CPython against the same code JIT-compiled by Numba."""
+        self._p("\n" + "="*80)
+        self._p("8. NUMBA JIT BASELINE (INTERPRETER HEADROOM)")
+        self._p("="*80)
+
+        if njit is None:
+            self._p("numba is not installed - skipping (pip install numba to enable this section)")
+            return
+
+        n = KERNEL_ITERATIONS
+        # Fixed-seed inputs: enqueue/dequeue deltas for the counter, and per-request outcome bits
+        # (bit k set = attempt k succeeds) where ~1 in 8 requests needs a retry
+        rng = random.Random(0)
+        deltas = [rng.choice((1, -1)) for _ in range(n)]
+        outcomes = [rng.randrange(1, 8) if rng.random() < 0.125 else 1 for _ in range(n)]
+        kernels = {
+            "_counter_kernel_py": _counter_kernel_py,
+            "_retry_kernel_py": _retry_kernel_py,
+            "_counter_kernel_jit": _counter_kernel_jit,
+            "_retry_kernel_jit": _retry_kernel_jit,
+            "deltas_py": deltas,
+            "outcomes_py": outcomes,
+            "deltas_jit": np.asarray(deltas, dtype=np.int64),
+            "outcomes_jit": np.asarray(outcomes, dtype=np.int64),
+        }
+        # Each JIT kernel is called once in setup so compilation (or cache load) stays out of the timing
+        for key, label, name, arg in (
+            (BenchKey.COUNTER_KERNEL_PY, "Counter kernel (Python)", "_counter_kernel_py", "deltas_py"),
+            (BenchKey.COUNTER_KERNEL_JIT, "Counter kernel (Numba)", "_counter_kernel_jit", "deltas_jit"),
+            (BenchKey.RETRY_KERNEL_PY, "Retry kernel (Python)", "_retry_kernel_py", "outcomes_py"),
+            (BenchKey.RETRY_KERNEL_JIT, "Retry kernel (Numba)", "_retry_kernel_jit", "outcomes_jit"),
+        ):
+            per_call = self.benchmark(key, f"{name}({arg})", setup=f"{name}({arg}[:1])", globals=kernels)
+            self._p(f"{label}: {self.format_result(key)} per {n:,} iterations "
+                    f"(~{per_call / n * 1000:.2f} ns/iter)")
+
+        # Both implementations must agree, or the speedup compares different work
+        if (_counter_kernel_py(deltas), _retry_kernel_py(outcomes)) != \
+                (_counter_kernel_jit(kernels["deltas_jit"]), _retry_kernel_jit(kernels["outcomes_jit"])):
+            self._p("⚠️  Python and Numba kernels disagree - speedups below are not comparable")
+
+        for kind, py_key, jit_key in (
+            ("Counter", BenchKey.COUNTER_KERNEL_PY, BenchKey.COUNTER_KERNEL_JIT),
+            ("Retry", BenchKey.RETRY_KERNEL_PY, BenchKey.RETRY_KERNEL_JIT),
+        ):
+            jit = self._us(jit_key)
+            if jit:
+                self._p(f"\n{kind} kernel speedup under JIT: {self._us(py_key) / jit:.0f}x")
 
     def analyze_async_operations(self):
         """Analyze async operation overhead."""
-        print("\n" + "="*80)
-        print("7. ASYNC OPERATION OVERHEAD")
-        print("="*80)
+        self._p("\n" + "="*80)
+        self._p("7. ASYNC OPERATION OVERHEAD")
+        self._p("="*80)
+
+        # await can't run inside timeit's loop, so each coroutine applies the same repeat/min scheme
+        # itself: `repeat` rounds of `iterations`, one clock read per round (not per iteration).
+        # The clock is bound as a coroutine local so each read is a LOAD_FAST, not time.perf_counter.
+        repeat = 7
+        iterations = 10_000
+        perf = time.perf_counter
+        # One event loop for both tests: loop setup/teardown is paid once, and both measure the same loop
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
 
         # asyncio.Lock acquire/release
-        async def test_async_lock():
+        async def test_async_lock(perf=perf):
             lock = asyncio.Lock()
-            iterations = 10_000
-            start = time.perf_counter()
-            for _ in range(iterations):
-                async with lock:
-                    pass
-            return (time.perf_counter() - start) / iterations * 1_000_000
-
-        time_async_lock = asyncio.run(test_async_lock())
-        print(f"asyncio.Lock acquire/release: {time_async_lock:.3f} μs")
+            rounds = []
+            for _ in range(repeat):
+                start = perf()
+                for _ in range(iterations):
+                    async with lock:
+                        pass
+                rounds.append((perf() - start) / iterations * 1_000_000)
+            return rounds
 
         # asyncio.sleep(0) - context switch
-        async def test_async_sleep():
-            iterations = 10_000
-            start = time.perf_counter()
-            for _ in range(iterations):
-                await asyncio.sleep(0)
-            return (time.perf_counter() - start) / iterations * 1_000_000
-
-        time_async_sleep = asyncio.run(test_async_sleep())
-        print(f"asyncio.sleep(0) - context switch: {time_async_sleep:.3f} μs")
+        async def test_async_sleep(perf=perf):
+            rounds = []
+            for _ in range(repeat):
+                start = perf()
+                for _ in range(iterations):
+                    await asyncio.sleep(0)
+                rounds.append((perf() - start) / iterations * 1_000_000)
+            return rounds
 
-        self.results["Async lock"] = time_async_lock
+        try:
+            with _gc_paused():
+                lock_rounds = loop.run_until_complete(test_async_lock())
+                sleep_rounds = loop.run_until_complete(test_async_sleep())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+        self._record(BenchKey.ASYNC_LOCK, lock_rounds, iterations)
+        self._p(f"asyncio.Lock acquire/release: {self.format_result(BenchKey.ASYNC_LOCK)}")
+        self._record(BenchKey.ASYNC_SLEEP, sleep_rounds, iterations)
+        self._p(f"asyncio.sleep(0) - context switch: {self.format_result(BenchKey.ASYNC_SLEEP)}")
 
     def generate_summary_report(self):
         """Generate comprehensive summary report."""
-        print("\n" + "="*80)
-        print("PERFORMANCE IMPACT SUMMARY")
-        print("="*80)
-
-        print("\n### CHANGE 1: Queue Size Logging (4 locations)")
-        print("-" * 80)
-        print("Location: Lines 690, 702, 672, 952 - Inside queue_count_lock")
-        print()
-        print("Per-request impact (DEBUG level DISABLED - production default):")
-        print(f"  - String formatting: ~{self.results.get('Complex queue log f-string', 0):.2f} μs * 2 calls = {self.results.get('Complex queue log f-string', 0) * 2:.2f} μs")
-        print(f"  - logging.debug() early return: ~{self.results.get('logging.debug() - INFO level', 0):.2f} μs * 2 calls = {self.results.get('logging.debug() - INFO level', 0) * 2:.2f} μs")
-        print(f"  - Lock hold time increase: ~{self.results.get('Lock with logging (disabled)', 0) - self.results.get('Lock without logging', 0):.2f} μs")
-        total_debug_disabled = (self.results.get('Complex queue log f-string', 0) +
-                                 self.results.get('logging.debug() - INFO level', 0)) * 2
-        print(f"  TOTAL: ~{total_debug_disabled:.2f} μs per request")
-        print(f"  IMPACT CATEGORY: NEGLIGIBLE (<0.1ms)")
-        print()
-
-        print("Per-request impact (DEBUG level ENABLED - if user enables it):")
-        print(f"  - String formatting: ~{self.results.get('Complex queue log f-string', 0):.2f} μs * 2 calls = {self.results.get('Complex queue log f-string', 0) * 2:.2f} μs")
-        print(f"  - logging.debug() I/O: ~{self.results.get('logging.debug() - DEBUG level', 0):.2f} μs * 2 calls = {self.results.get('logging.debug() - DEBUG level', 0) * 2:.2f} μs")
-        print(f"  - Lock hold time increase: ~{self.results.get('Lock with logging (enabled)', 0) - self.results.get('Lock without logging', 0):.2f} μs")
-        total_debug_enabled = (self.results.get('Complex queue log f-string', 0) +
-                                self.results.get('logging.debug() - DEBUG level', 0)) * 2
-        print(f"  TOTAL: ~{total_debug_enabled:.2f} μs per request")
-        print(f"  IMPACT CATEGORY: MINOR (~{total_debug_enabled/1000:.3f}ms)")
-        print()
-
-        print("CRITICAL FINDING:")
-        print("  ⚠️  F-strings are evaluated EVEN WHEN logging.debug() is disabled!")
-        print("  ⚠️  Locks are held ~{:.2f} μs longer with DEBUG enabled!".format(
-            self.results.get('Lock with logging (enabled)', 0) - self.results.get('Lock without logging', 0)))
-        print("  ⚠️  With high concurrency, this WILL increase lock contention!")
-        print()
-
-        print("### CHANGE 2: Configuration Validation")
-        print("-" * 80)
-        print("Location: Lines 43-55, 103-106 - Module load time (once)")
-        print()
-        print("Impact: ONE-TIME at startup (~1-2ms total)")
-        print("IMPACT CATEGORY: NEGLIGIBLE (not in request path)")
-        print()
-
-        print("### CHANGE 3: HTTP Connection Pool Changes")
-        print("-" * 80)
-        print("Before: 100 connections (50 * 2)")
-        print("After:  150 connections (50 * 3)")
-        print()
-        print("CPU impact:")
-        print(f"  - Connection lookup overhead: ~{self.results.get('Dict lookup (150 items)', 0) - self.results.get('Dict lookup (100 items)', 0):.3f} μs")
-        print(f"  IMPACT CATEGORY: NEGLIGIBLE (O(1) dict lookup)")
-        print()
-        print("Memory impact:")
-        print("  - Additional connections: 50")
-        print("  - Memory per connection: ~8-16 KB")
-        print("  - Total additional memory: ~800 KB")
-        print("  IMPACT CATEGORY: NEGLIGIBLE (~0.8 MB)")
-        print()
-
-        print("### CHANGE 4: Retry Logic with Exponential Backoff")
-        print("-" * 80)
-        print("Location: Lines 860-894 - On every request")
-        print()
-        print("Impact on SUCCESS path (no retries needed - 99.9% of requests):")
-        print(f"  - Retry loop overhead: ~{self.results.get('With retry loop', 0) - self.results.get('Direct call', 0):.2f} μs")
-        print(f"  - Try-except overhead: ~0.1 μs")
-        print(f"  - Range iteration: ~0.05 μs")
-        print(f"  TOTAL: ~{self.results.get('With retry loop', 0) - self.results.get('Direct call', 0):.2f} μs per request")
-        print(f"  IMPACT CATEGORY: NEGLIGIBLE (<0.1ms)")
-        print()
-        print("Impact on FAILURE path (connection errors):")
-        print("  - First retry: +1.0s delay")
-        print("  - Second retry: +1.5s delay")
-        print("  - Third attempt: fails immediately")
-        print("  TOTAL: +2.5s for connection failures")
-        print("  IMPACT CATEGORY: SIGNIFICANT (but only on failures)")
-        print()
-
-        print("### CHANGE 5: Counter Management Changes")
-        print("-" * 80)
-        print("Before: counter_decremented = False/True")
-        print("After:  counter_needs_cleanup = True/False")
-        print()
-        print("Impact:")
-        print(f"  - Variable operations: ~{self.results.get('Boolean assignment', 0):.3f} μs")
-        print(f"  - Logic inversion (not vs boolean): ZERO (compiled to same bytecode)")
-        print(f"  IMPACT CATEGORY: NEGLIGIBLE (<0.1μs)")
-        print()
-
-        print("### CHANGE 6: Enhanced Error Logging")
-        print("-" * 80)
-        print("Location: Lines 930, 937 - Only executed on errors")
-        print()
-        print("Impact on SUCCESS path: ZERO")
-        print("Impact on ERROR path:")
-        print(f"  - String formatting: ~{self.results.get('Complex queue log f-string', 0):.2f} μs")
-        print(f"  - logging.error() I/O: ~{self.results.get('logging.debug() - DEBUG level', 0):.2f} μs")
-        print(f"  IMPACT CATEGORY: NEGLIGIBLE (only on errors, I/O already slow)")
-        print()
-
-        print("="*80)
-        print("OVERALL ASSESSMENT")
-        print("="*80)
-        print()
-        print("Total overhead per request (production config - DEBUG disabled):")
+        self._p("\n" + "="*80)
+        self._p("PERFORMANCE IMPACT SUMMARY")
+        self._p("="*80)
+
+        self._p("\n### CHANGE 1: Queue Size Logging (4 locations)")
+        self._p("-" * 80)
+        self._p("Location: Lines 690, 702, 672, 952 - Inside queue_count_lock")
+        self._p()
+        self._p("Per-request impact (DEBUG level DISABLED - production default):")
+        self._p(f"  - String formatting: ~{self._fmt_us(BenchKey.COMPLEX_FSTRING, 2)} * 2 calls = {self._us(BenchKey.COMPLEX_FSTRING) * 2:.2f} μs")
+        self._p(f"  - logging.debug() early return: ~{self._fmt_us(BenchKey.DEBUG_FSTRING_DISABLED, 2)} * 2 calls = {self._us(BenchKey.DEBUG_FSTRING_DISABLED) * 2:.2f} μs")
+        self._p(f"  - Lock hold time increase: ~{self._fmt_delta(BenchKey.LOCK_LOG_DISABLED, BenchKey.LOCK_BARE, 2)}")
+        total_debug_disabled = (self._us(BenchKey.COMPLEX_FSTRING) +
+                                self._us(BenchKey.DEBUG_FSTRING_DISABLED)) * 2
+        self._p(f"  TOTAL: ~{total_debug_disabled:.2f} μs per request")
+        self._p(f"  IMPACT CATEGORY: NEGLIGIBLE (<0.1ms)")
+        self._p(f"  With %s-style args instead: ~{self._us(BenchKey.DEBUG_LAZY_DISABLED) * 2:.2f} μs per request "
+                f"(no formatting on the disabled path)")
+        self._p()
+
+        self._p("Per-request impact (DEBUG level ENABLED - if user enables it):")
+        self._p(f"  - String formatting: ~{self._fmt_us(BenchKey.COMPLEX_FSTRING, 2)} * 2 calls = {self._us(BenchKey.COMPLEX_FSTRING) * 2:.2f} μs")
+        self._p(f"  - logging.debug() I/O: ~{self._fmt_us(BenchKey.DEBUG_FSTRING_ENABLED, 2)} * 2 calls = {self._us(BenchKey.DEBUG_FSTRING_ENABLED) * 2:.2f} μs")
+        self._p(f"  - Lock hold time increase: ~{self._fmt_delta(BenchKey.LOCK_LOG_ENABLED, BenchKey.LOCK_BARE, 2)}")
+        self._p(f"    (~{self._fmt_delta(BenchKey.LOCK_SNAPSHOT, BenchKey.LOCK_BARE, 2)} if logged after release; "
+                f"per-iteration cost then {self._fmt_us(BenchKey.LOCK_LOG_OUTSIDE, 2)}, the logging part unlocked)")
+        total_debug_enabled = (self._us(BenchKey.COMPLEX_FSTRING) +
+                               self._us(BenchKey.DEBUG_FSTRING_ENABLED)) * 2
+        self._p(f"  TOTAL: ~{total_debug_enabled:.2f} μs per request")
+        self._p(f"  IMPACT CATEGORY: MINOR (~{total_debug_enabled/1000:.3f}ms)")
+        self._p()
+
+        self._p("CRITICAL FINDING:")
+        self._p("  ⚠️  F-strings are evaluated EVEN WHEN logging.debug() is disabled!")
+        self._p(f"  ⚠️  Locks are held ~{self._fmt_delta(BenchKey.LOCK_LOG_ENABLED, BenchKey.LOCK_BARE)} longer with DEBUG enabled!")
+        self._p("  ⚠️  With high concurrency, this WILL increase lock contention!")
+        self._p()
+
+        self._p("### CHANGE 2: Configuration Validation")
+        self._p("-" * 80)
+        self._p("Location: Lines 43-55, 103-106 - Module load time (once)")
+        self._p()
+        self._p("Impact: ONE-TIME at startup (~1-2ms total)")
+        self._p("IMPACT CATEGORY: NEGLIGIBLE (not in request path)")
+        self._p()
+
+        self._p("### CHANGE 3: HTTP Connection Pool Changes")
+        self._p("-" * 80)
+        self._p("Before: 100 connections (50 * 2)")
+        self._p("After:  150 connections (50 * 3)")
+        self._p()
+        self._p("CPU impact:")
+        self._p(f"  - Connection lookup overhead: ~{self._fmt_delta(BenchKey.POOL_LOOKUP_150, BenchKey.POOL_LOOKUP_100, 3)}")
+        self._p(f"  IMPACT CATEGORY: NEGLIGIBLE (O(1) dict lookup)")
+        self._p()
+        self._p("Memory impact:")
+        self._p("  - Additional connections: 50")
+        self._p("  - Memory per connection: ~8-16 KB")
+        self._p("  - Total additional memory: ~800 KB")
+        self._p("  IMPACT CATEGORY: NEGLIGIBLE (~0.8 MB)")
+        self._p()
+
+        self._p("### CHANGE 4: Retry Logic with Exponential Backoff")
+        self._p("-" * 80)
+        self._p("Location: Lines 860-894 - On every request")
+        self._p()
+        self._p("Impact on SUCCESS path (no retries needed - 99.9% of requests):")
+        self._p(f"  - Retry loop overhead: ~{self._fmt_delta(BenchKey.RETRY_LOOP, BenchKey.DIRECT_CALL, 2)}")
+        self._p(f"  - Try-except overhead: ~0.1 μs")
+        self._p(f"  - Range iteration: ~0.05 μs")
+        self._p(f"  TOTAL: ~{self._fmt_delta(BenchKey.RETRY_LOOP, BenchKey.DIRECT_CALL, 2)} per request")
+        self._p(f"  Unrolled first attempt: ~{self._fmt_delta(BenchKey.RETRY_UNROLLED, BenchKey.DIRECT_CALL, 2)} per request")
+        self._p(f"  IMPACT CATEGORY: NEGLIGIBLE (<0.1ms)")
+        self._p()
+        self._p("Impact on FAILURE path (connection errors):")
+        self._p("  - First retry: +1.0s delay")
+        self._p("  - Second retry: +1.5s delay")
+        self._p("  - Third attempt: fails immediately")
+        self._p("  TOTAL: +2.5s for connection failures")
+        self._p("  IMPACT CATEGORY: SIGNIFICANT (but only on failures)")
+        self._p()
+
+        self._p("### CHANGE 5: Counter Management Changes")
+        self._p("-" * 80)
+        self._p("Before: counter_decremented = False/True")
+        self._p("After:  counter_needs_cleanup = True/False")
+        self._p()
+        self._p("Impact:")
+        self._p(f"  - Variable operations: ~{self._fmt_us(BenchKey.BOOL_ASSIGN, 3)}")
+        self._p(f"  - Logic inversion (not vs boolean): ZERO (compiled to same bytecode)")
+        self._p(f"  IMPACT CATEGORY: NEGLIGIBLE (<0.1μs)")
+        self._p()
+
+        self._p("### CHANGE 6: Enhanced Error Logging")
+        self._p("-" * 80)
+        self._p("Location: Lines 930, 937 - Only executed on errors")
+        self._p()
+        self._p("Impact on SUCCESS path: ZERO")
+        self._p("Impact on ERROR path:")
+        self._p(f"  - String formatting: ~{self._fmt_us(BenchKey.COMPLEX_FSTRING, 2)}")
+        self._p(f"  - logging.error() I/O: ~{self._fmt_us(BenchKey.DEBUG_FSTRING_ENABLED, 2)}")
+        self._p(f"  IMPACT CATEGORY: NEGLIGIBLE (only on errors, I/O already slow)")
+        self._p()
+
+        self._p("="*80)
+        self._p("OVERALL ASSESSMENT")
+        self._p("="*80)
+        self._p()
+        self._p("Total overhead per request (production config - DEBUG disabled):")
         total_overhead = (
             total_debug_disabled +  # Queue logging
-            (self.results.get('With retry loop', 0) - self.results.get('Direct call', 0))  # Retry loop
+            (self._us(BenchKey.RETRY_LOOP) - self._us(BenchKey.DIRECT_CALL))  # Retry loop
         )
-        print(f"  {total_overhead:.2f} μs = {total_overhead/1000:.4f} ms")
-        print()
-        print("Total overhead per request (DEBUG enabled):")
+        self._p(f"  {total_overhead:.2f} μs = {total_overhead/1000:.4f} ms")
+        self._p()
+        self._p("Total overhead per request (DEBUG enabled):")
         total_overhead_debug = (
             total_debug_enabled +  # Queue logging
-            (self.results.get('With retry loop', 0) - self.results.get('Direct call', 0))  # Retry loop
+            (self._us(BenchKey.RETRY_LOOP) - self._us(BenchKey.DIRECT_CALL))  # Retry loop
         )
-        print(f"  {total_overhead_debug:.2f} μs = {total_overhead_debug/1000:.4f} ms")
-        print()
-
-        print("VERDICT:")
-        print("-" * 80)
-        print()
-        print("✓ With DEBUG level DISABLED (production default):")
-        print(f"    Impact: ~{total_overhead:.2f} μs ({total_overhead/1000:.4f} ms) per request")
-        print("    Conclusion: NEGLIGIBLE IMPACT")
-        print("    These changes should NOT cause noticeable slowdown.")
-        print()
-        print("⚠️  With DEBUG level ENABLED:")
-        print(f"    Impact: ~{total_overhead_debug:.2f} μs ({total_overhead_debug/1000:.4f} ms) per request")
-        print(f"    Lock contention increase: ~{self.results.get('Lock with logging (enabled)', 0) - self.results.get('Lock without logging', 0):.2f} μs per lock")
-        print("    Conclusion: MINOR IMPACT")
-        print("    At 1000 req/s: Additional CPU time = ~{:.2f}ms/s".format(total_overhead_debug * 1000 / 1000))
-        print("    At 10000 req/s: Additional CPU time = ~{:.2f}ms/s = {:.1f}% CPU".format(
+        self._p(f"  {total_overhead_debug:.2f} μs = {total_overhead_debug/1000:.4f} ms")
+        total_inputs = (BenchKey.COMPLEX_FSTRING, BenchKey.DEBUG_FSTRING_DISABLED, BenchKey.DEBUG_FSTRING_ENABLED,
+                        BenchKey.RETRY_LOOP, BenchKey.DIRECT_CALL)
+        unreliable = [key.value for key in total_inputs if not self.results[key.ns][key].reliable]
+        if unreliable:
+            self._p(f"  NOTE: totals include UNRELIABLE inputs (cv > {CV_THRESHOLD:.0%}): {', '.join(unreliable)}")
+        self._p()
+
+        self._p("VERDICT:")
+        self._p("-" * 80)
+        self._p()
+        self._p("✓ With DEBUG level DISABLED (production default):")
+        self._p(f"    Impact: ~{total_overhead:.2f} μs ({total_overhead/1000:.4f} ms) per request")
+        self._p("    Conclusion: NEGLIGIBLE IMPACT")
+        self._p("    These changes should NOT cause noticeable slowdown.")
+        self._p()
+        self._p("⚠️  With DEBUG level ENABLED:")
+        self._p(f"    Impact: ~{total_overhead_debug:.2f} μs ({total_overhead_debug/1000:.4f} ms) per request")
+        self._p(f"    Lock contention increase: ~{self._fmt_delta(BenchKey.LOCK_LOG_ENABLED, BenchKey.LOCK_BARE, 2)} per lock")
+        self._p("    Conclusion: MINOR IMPACT")
+        self._p("    At 1000 req/s: Additional CPU time = ~{:.2f}ms/s".format(total_overhead_debug * 1000 / 1000))
+        self._p("    At 10000 req/s: Additional CPU time = ~{:.2f}ms/s = {:.1f}% CPU".format(
             total_overhead_debug * 10000 / 1000,
             (total_overhead_debug * 10000 / 1000) / 1000 * 100
         ))
-        print()
-        print("RECOMMENDATIONS:")
-        print("-" * 80)
-        print()
-        print("1. Keep LOG_LEVEL=INFO in production (current default)")
-        print("   - This minimizes logging overhead")
-        print("   - DEBUG logs still evaluated (f-strings) but not written")
-        print()
-        print("2. Consider lazy logging for hot paths:")
-        print("   - Instead of: logging.debug(f'Queue: {a}/{b}')")
-        print("   - Use: logging.debug('Queue: %s/%s', a, b)")
-        print("   - This avoids f-string evaluation when DEBUG disabled")
-        print()
-        print("3. Move logging outside locks if possible:")
-        print("   - Calculate message inside lock")
-        print("   - Log outside lock")
-        print("   - Reduces lock hold time")
-        print()
-        print("4. Connection pool size increase is fine:")
-        print("   - Only 800 KB additional memory")
-        print("   - No CPU overhead (O(1) lookup)")
-        print()
-        print("5. Retry logic is fine:")
-        print("   - Minimal overhead on success path")
-        print("   - Only adds delay on actual failures")
-        print()
-
-        print("PROBABLE CAUSE OF SLOWDOWN:")
-        print("-" * 80)
-        print()
-        print("If users are experiencing slowdown, the changes analyzed here are")
-        print("likely NOT the cause. Investigate:")
-        print()
-        print("1. Is DEBUG logging enabled? (check LOG_LEVEL environment variable)")
-        print("2. Are there more queue rejections? (429 errors)")
-        print("3. Has GATEWAY_MAX_QUEUE_SIZE been reduced?")
-        print("4. Has GATEWAY_MAX_CONCURRENT been reduced?")
-        print("5. Are there more connection errors triggering retries?")
-        print("6. Is the vLLM backend itself slower?")
-        print("7. Are there more containers being evicted (memory pressure)?")
-        print()
+        self._p()
+        self._p("RECOMMENDATIONS:")
+        self._p("-" * 80)
+        self._p()
+        self._p("1. Keep LOG_LEVEL=INFO in production (current default)")
+        self._p("   - This minimizes logging overhead")
+        self._p("   - f-string DEBUG logs are still evaluated but not written (%s-style ones are not)")
+        self._p()
+        self._p("2. Guard hot-path debug logs, or at least log lazily:")
+        self._p("   - Best: if logger.isEnabledFor(logging.DEBUG): logger.debug(f\"...\")")
+        self._p("     (or cache _is_debug = logger.isEnabledFor(logging.DEBUG) at module scope")
+        self._p(f"      when the level never changes at runtime: ~{self._fmt_us(BenchKey.GUARD_CACHED_FLAG, 3)}"
+                f" vs ~{self._fmt_us(BenchKey.GUARD_FSTRING, 3)} unguarded)")
+        self._p("   - Instead of: logger.debug(f\"Request queued for {model_name} ({target_model_id}). Queue depth: {depth}/{max_size}\")")
+        self._p("   - Use: logger.debug(\"Request queued for %s (%s). Queue depth: %s/%s\", model_name, target_model_id, depth, max_size)")
+        self._p("   - This defers formatting to LogRecord.getMessage(), skipped when DEBUG disabled")
+        self._p(f"   - Fixed-layout messages built eagerly: f-string ~{self._fmt_us(BenchKey.COMPLEX_FSTRING, 3)}, "
+                f"bound str.format ~{self._fmt_us(BenchKey.BOUND_STR_FORMAT, 3)}, "
+                f"string.Template ~{self._fmt_us(BenchKey.STRING_TEMPLATE, 3)} (pick the cheapest on your Python)")
+        self._p()
+        self._p("3. Move logging outside locks if possible:")
+        self._p("   - Inside the lock: counter += 1; snapshot = counter")
+        self._p("   - After release: logger.debug(\"Queue depth: %s/%s\", snapshot, max_size)")
+        self._p(f"   - Lock hold time drops to the bare critical section (~{self._fmt_us(BenchKey.LOCK_BARE, 2)})")
+        self._p()
+        self._p("4. Connection pool size increase is fine:")
+        self._p("   - Only 800 KB additional memory")
+        self._p("   - No CPU overhead (O(1) lookup)")
+        self._p()
+        self._p("5. Retry logic is fine:")
+        self._p("   - Minimal overhead on success path")
+        self._p("   - Unrolling the first attempt out of the loop trims it further")
+        self._p("   - Only adds delay on actual failures")
+        self._p()
+
+        self._p("PROBABLE CAUSE OF SLOWDOWN:")
+        self._p("-" * 80)
+        self._p()
+        self._p("If users are experiencing slowdown, the changes analyzed here are")
+        self._p("likely NOT the cause. Investigate:")
+        self._p()
+        self._p("1. Is DEBUG logging enabled? (check LOG_LEVEL environment variable)")
+        self._p("2. Are there more queue rejections? (429 errors)")
+        self._p("3. Has GATEWAY_MAX_QUEUE_SIZE been reduced?")
+        self._p("4. Has GATEWAY_MAX_CONCURRENT been reduced?")
+        self._p("5. Are there more connection errors triggering retries?")
+        self._p("6. Is the vLLM backend itself slower?")
+        self._p("7. Are there more containers being evicted (memory pressure)?")
+        self._p()
+
+
+# analyze_* sections, in report order. They share no state, so main() runs them in separate processes.
+ANALYSES = (
+    "analyze_string_formatting",
+    "analyze_logging_overhead",
+    "analyze_isenabled_guard",
+    "analyze_lock_hold_time",
+    "analyze_retry_loop_overhead",
+    "analyze_variable_overhead",
+    "analyze_connection_pool_impact",
+    "analyze_async_operations",
+    "analyze_numba_baseline",
+)
+
+
+_worker_cpu: "int | None" = None  # core owned by this pool worker process (set by _init_worker)
+
+
+def _init_worker(cpu_queue) -> None:
+    """Pool initializer: claim one core from `cpu_queue` for the lifetime of this worker.
+
+    Cores are handed out per worker rather than per task, so two workers never time on the same
+    core even when a worker runs several sections back to back."""
+    global _worker_cpu
+    _worker_cpu = cpu_queue.get()
+
+
+def _run_analysis(method_name: str) -> Tuple[str, Dict[str, Dict[BenchKey, BenchResult]], float, bool]:
+    """Worker entry point: run one analyze_* section on a fresh analyzer, pinned to the worker's core.
+
+    Returns the section's report text (buffered, so parallel sections don't interleave), its
+    results dict for the parent to merge, the timeit loop overhead it subtracted and whether its
+    priority was raised."""
+    analyzer = PerformanceAnalyzer(cpu=_worker_cpu)
+    getattr(analyzer, method_name)()
+    return analyzer.flush_output(), analyzer.results, analyzer._overhead_us, analyzer.priority_raised
 
 
 def main():
     """Run all performance analyses."""
-    analyzer = PerformanceAnalyzer()
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    # Report-only analyzer: the parent just collects results, so it doesn't pin or time anything
+    analyzer = PerformanceAnalyzer(timing=False)
 
     print("="*80)
     print("vLLM GATEWAY PERFORMANCE IMPACT ANALYSIS")
@@ -517,14 +1062,37 @@ def main():
     print("All measurements are in microseconds (μs) unless otherwise noted.")
     print()
 
-    analyzer.analyze_string_formatting()
-    analyzer.analyze_logging_overhead()
-    analyzer.analyze_lock_hold_time()
-    analyzer.analyze_retry_loop_overhead()
-    analyzer.analyze_variable_overhead()
-    analyzer.analyze_connection_pool_impact()
-    analyzer.analyze_async_operations()
+    # At most one worker per distinct core; each worker claims its own core once (see _init_worker),
+    # so with fewer cores than sections the extra sections queue instead of sharing a core.
+    # With more than one core, one is kept back and the parent moves onto the leftover cores, so it
+    # never shares a core with a worker. Output is printed in report order as the sections complete.
+    n_workers = min(len(ANALYSES), max(1, len(cpus) - 1))
+    if len(cpus) > 1 and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, set(cpus[n_workers:]))
+    cpu_queue = multiprocessing.Queue()
+    for cpu in cpus[:n_workers]:
+        cpu_queue.put(cpu)
+    overheads_us = []
+    all_priority_raised = True
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(cpu_queue,)) as ex:
+        futures = [ex.submit(_run_analysis, name) for name in ANALYSES]
+        for future in futures:
+            output, results, overhead_us, priority_raised = future.result()
+            sys.stdout.write(output)
+            for ns, entries in results.items():
+                analyzer.results[ns].update(entries)
+            overheads_us.append(overhead_us)
+            all_priority_raised = all_priority_raised and priority_raised
+
+    if not all_priority_raised:
+        logging.warning(f"Could not raise scheduling priority to nice {BENCH_NICE} (needs root); "
+                        f"expect more run-to-run noise")
+    print(f"timeit loop overhead (estimated per section, subtracted from its results): "
+          f"{min(overheads_us):.4f}-{max(overheads_us):.4f} μs")
+    print()
+
     analyzer.generate_summary_report()
+    sys.stdout.write(analyzer.flush_output())
 
     print()
     print("="*80)
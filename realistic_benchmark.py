@@ -1,11 +1,31 @@
 #!/usr/bin/env python3
 """
 Realistic performance test simulating actual gateway behavior
+
+Pins itself to one CPU (BENCH_CPU, default: the last allowed one) and tries to raise its priority;
+for the least noise run as root on an idle core with the performance governor, e.g.
+    sudo BENCH_CPU=3 chrt -f 99 taskset -c 3 python realistic_benchmark.py
 """
-import time
+import io
+import timeit
+import textwrap
 import threading
+import itertools
 import logging
+import logging.handlers
 import os
+import sys
+import bisect
+import array
+import _thread
+import subprocess
+import ctypes
+import ctypes.util
+import operator
+from collections import deque
+from contextlib import contextmanager
+
+from bench_utils import BENCH_NICE, MemoizingFormatter, cpu_governor, pin_cpu, raise_priority
 
 # Setup logging like the gateway does
 logging.basicConfig(
@@ -13,84 +33,383 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-print("=" * 80)
-print("REALISTIC GATEWAY PERFORMANCE TEST")
-print("=" * 80)
-print()
+# Child mode used by test_with_logging_O_mode: time the production path under -O and print only the figure
+DEBUG_STRIPPED_MODE = "--mode=debug-stripped" in sys.argv[1:]
+
+# Pin to BENCH_CPU (default: the last allowed core) and raise priority; every step is best-effort.
+# The original affinity is kept so the contended thread sweep can run on all cores.
+original_affinity = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else None
+try:
+    bench_cpu = pin_cpu(int(os.environ["BENCH_CPU"]) if "BENCH_CPU" in os.environ else None)
+except ValueError:
+    bench_cpu = None
+priority_raised = raise_priority()
+
+if not DEBUG_STRIPPED_MODE:
+    print("=" * 80)
+    print("REALISTIC GATEWAY PERFORMANCE TEST")
+    print("=" * 80)
+    print()
+    if bench_cpu is None:
+        print("⚠️ Could not pin to a CPU (no sched_setaffinity or bad BENCH_CPU); expect more noise")
+    else:
+        print(f"Pinned to CPU {bench_cpu} (set BENCH_CPU to choose another)")
+        governor = cpu_governor(bench_cpu)
+        if governor is not None and governor != "performance":
+            print(f"⚠️ CPU {bench_cpu} scaling governor is '{governor}', not 'performance'; "
+                  f"frequency scaling will add noise")
+    if not priority_raised:
+        print(f"⚠️ Could not raise priority to nice {BENCH_NICE} (needs root); expect more run-to-run noise")
+    print()
+
+# Bound str.format methods for the fixed-precision numbers in the report: the format spec is
+# parsed once here instead of at every f-string call site
+_fmt1 = "{:.1f}".format
+_fmt2 = "{:.2f}".format
+_fmt3 = "{:.3f}".format
+_fmt3s = "{:+.3f}".format
+_fmt6 = "{:.6f}".format
 
 # Test parameters
 model_name = "gpt-4"
 target_model_id = "openai/gpt-4"
 max_size = 200
 
+# Verdict bands for a per-request overhead in μs: VERDICTS[i] covers totals below VERDICT_THRESHOLDS_US[i]
+VERDICT_THRESHOLDS_US = (1, 10, 100, 1000)
+VERDICTS = (
+    "NEGLIGIBLE (< 1 μs)",
+    "VERY MINOR (< 10 μs)",
+    "MINOR (< 100 μs)",
+    "MODERATE (< 1 ms)",
+    "SIGNIFICANT (>= 1 ms)",
+)
+
+# Format string of the queue log line, built once rather than per call
+_FMT = "Request queued for %s (%s). Queue depth: %d/%d"
+# Loop-invariant part of the same line, interpolated once; only the depth is formatted per call
+_PREFIX = f"Request queued for {model_name} ({target_model_id}). Queue depth: "
+_SUFFIX = f"/{max_size}"
+
 # Simulate the actual lock+logging code from lines 666-691
 lock = threading.Lock()
-counter = 0
 
-def test_without_logging(iterations):
-    """Original code without logging"""
-    global counter
-    counter = 0
-    start = time.perf_counter()
+# Untimed iterations run before each measurement so the 3.11+ adaptive interpreter has specialized
+# the statement's bytecode (and 3.13's JIT, if enabled, has compiled it) before the clock starts
+WARMUP_ITERATIONS = 10_000
+
+def _bench(stmt, setup="pass", number=None, repeat=7):
+    """Best-of-`repeat` μs per execution of `stmt`, timed by timeit (number autoranged unless given).
+
+    setup/stmt run inside timeit's generated function, so names they assign are locals;
+    module globals (lock, model_name, ...) are visible through globals=globals().
+    A warmup of WARMUP_ITERATIONS (capped at `number`) runs first and is discarded.
+    """
+    timer = timeit.Timer(textwrap.dedent(stmt), textwrap.dedent(setup), globals=globals())
+    timer.timeit(min(WARMUP_ITERATIONS, number or WARMUP_ITERATIONS))
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1_000_000
 
-    for i in range(iterations):
+# Cost of timeit's own `for` loop per iteration; subtracted from every figure below so the
+# reported μs/op (and the overhead percentages) cover the statement only
+loop_baseline = _bench("pass")
+
+def test_without_logging(number=None):
+    """Original code without logging"""
+    return _bench("""
         with lock:
             current_depth = counter
             counter += 1
+    """, "counter = 0", number) - loop_baseline
 
-    elapsed = time.perf_counter() - start
-    return elapsed / iterations * 1_000_000  # μs per operation
-
-def test_with_logging_disabled(iterations):
-    """New code with logging (but DEBUG disabled - production)"""
-    global counter
-    counter = 0
-    start = time.perf_counter()
-
-    for i in range(iterations):
+def test_with_logging_as_shipped(number=None):
+    """The log line as gateway/app.py ships it (DEBUG disabled): the f-string is built on every call"""
+    return _bench("""
         with lock:
             current_depth = counter
             counter += 1
             logging.debug(f"Request queued for {model_name} ({target_model_id}). Queue depth: {counter}/{max_size}")
+    """, "counter = 0", number) - loop_baseline
+
+def test_with_logging_disabled(number=None):
+    """Optimized log line (DEBUG disabled - production): guarded, lazy %-style"""
+    # The level can't change mid-test, so check it once instead of on every call; the bound
+    # logger.debug and format string are setup locals, so the loop body reads them with LOAD_FAST.
+    # Under python -O, __debug__ is constant False and the compiler drops the whole branch.
+    return _bench("""
+        with lock:
+            current_depth = counter
+            counter += 1
+            if __debug__ and debug_enabled:
+                _debug(_fmt, model_name, target_model_id, counter, max_size)
+    """, """
+        counter = 0
+        logger = logging.getLogger()
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        _debug = logger.debug
+        _fmt = _FMT
+    """, number) - loop_baseline
+
+def _stringio_handler():
+    """Handler that formats like the basicConfig stderr handler but writes to an in-memory io.StringIO
+    (full in-process emission cost, no write(2) per line)"""
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.getLogger().handlers[0].formatter)
+    return handler
+
+@contextmanager
+def _debug_logging(handlers=None):
+    """Temporarily enable DEBUG on the root logger and route it to `handlers`.
+
+    Defaults to a StringIO handler, so the timing covers building, formatting and writing the
+    record, minus the terminal; the handler-specific tests pass their own sink.
+    """
+    root = logging.getLogger()
+    if handlers is None:
+        handlers = [_stringio_handler()]
+    old_level, old_handlers = root.level, root.handlers[:]
+    root.setLevel(logging.DEBUG)
+    root.handlers = handlers
+    try:
+        yield root
+    finally:
+        root.setLevel(old_level)
+        root.handlers = old_handlers
+
+# Guard re-checked per call, as a live code path would (the level may change at runtime)
+_ENABLED_STMT = """
+    with lock:
+        current_depth = counter
+        counter += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            _debug(_fmt, model_name, target_model_id, counter, max_size)
+"""
+_ENABLED_SETUP = """
+    counter = 0
+    logger = logging.getLogger()
+    _debug = logger.debug
+    _fmt = _FMT
+"""
 
-    elapsed = time.perf_counter() - start
-    return elapsed / iterations * 1_000_000
+def test_with_logging_enabled(number):
+    """New code with logging (DEBUG enabled, records formatted into a StringIO)"""
+    with _debug_logging():
+        return _bench(_ENABLED_STMT, _ENABLED_SETUP, number) - loop_baseline
+
+def test_with_logging_record_only(number):
+    """DEBUG enabled, records dropped by a NullHandler: record creation and dispatch only, never formatted"""
+    with _debug_logging([logging.NullHandler()]):
+        return _bench(_ENABLED_STMT, _ENABLED_SETUP, number) - loop_baseline
+
+@contextmanager
+def _lean_log_records():
+    """Turn off the stdlib's optional per-record work: caller lookup (_srcfile=None skips
+    findCaller's frame walk) and the thread / process / multiprocessing fields of LogRecord"""
+    flags = ("_srcfile", "logThreads", "logProcesses", "logMultiprocessing", "logAsyncioTasks")
+    saved = {name: getattr(logging, name) for name in flags if hasattr(logging, name)}  # logAsyncioTasks: 3.12+
+    for name in saved:
+        setattr(logging, name, None if name == "_srcfile" else False)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(logging, name, value)
+
+def test_with_logging_enabled_lean(number):
+    """DEBUG enabled (StringIO) with filename discovery and thread/process fields disabled"""
+    with _debug_logging(), _lean_log_records():
+        return _bench(_ENABLED_STMT, _ENABLED_SETUP, number) - loop_baseline
+
+def test_with_debug_to_stderr(number):
+    """DEBUG enabled, emitted through the basicConfig stderr handler (formatting + write per call)"""
+    with _debug_logging(logging.getLogger().handlers[:]):
+        return _bench(_ENABLED_STMT, _ENABLED_SETUP, number) - loop_baseline
+
+# Same log line with the varying depth moved to the last slot, which is what MemoizingFormatter keys around
+_FMT_DEPTH_LAST = "Request queued for %s (%s), capacity %d. Queue depth: %d"
+_DEPTH_LAST_STMT = """
+    with lock:
+        current_depth = counter
+        counter += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            _debug(_fmt, model_name, target_model_id, max_size, counter)
+"""
+_DEPTH_LAST_SETUP = _ENABLED_SETUP.replace("_FMT", "_FMT_DEPTH_LAST")
+
+def test_with_debug_formatter(number, formatter):
+    """DEBUG enabled, depth-last log line formatted by `formatter` into a StringIO"""
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(formatter)
+    with _debug_logging([handler]):
+        return _bench(_DEPTH_LAST_STMT, _DEPTH_LAST_SETUP, number) - loop_baseline
+
+def test_with_debug_to_memory_handler(number):
+    """DEBUG enabled, records buffered by a MemoryHandler and flushed to a StringIO in batches of 1000"""
+    handler = logging.handlers.MemoryHandler(1000, flushLevel=logging.CRITICAL, target=_stringio_handler())
+    try:
+        with _debug_logging([handler]):
+            return _bench(_ENABLED_STMT, _ENABLED_SETUP, number) - loop_baseline
+    finally:
+        handler.close()
+
+def test_with_logging_enabled_prefixed(number):
+    """DEBUG enabled, constant prefix pre-interpolated so each record formats only the depth"""
+    with _debug_logging():
+        return _bench("""
+            with lock:
+                current_depth = counter
+                counter += 1
+                if logger.isEnabledFor(logging.DEBUG):
+                    _debug("%s%d%s", _PREFIX, counter, _SUFFIX)
+        """, """
+            counter = 0
+            logger = logging.getLogger()
+            _debug = logger.debug
+        """, number) - loop_baseline
+
+def test_with_atomic_counter(number=None):
+    """Counter without the lock: next() on an itertools.count is one C call, atomic under the GIL"""
+    return _bench("current_depth = next(depth_counter)",
+                  "depth_counter = itertools.count()", number) - loop_baseline
+
+def test_with_list_counter(number=None):
+    """Counter in a one-element list, no lock. NOT thread-safe: box[0] += 1 is a read, add and store
+    in separate bytecodes, so another thread can interleave. Shown only as the cost floor."""
+    return _bench("""
+        current_depth = box[0]
+        box[0] += 1
+    """, "box = [0]", number) - loop_baseline
+
+def test_lock_try_finally(number=None):
+    """Same critical section with explicit acquire()/try/finally/release() instead of `with`"""
+    return _bench("""
+        acquire()
+        try:
+            current_depth = counter
+            counter += 1
+        finally:
+            release()
+    """, "counter = 0; acquire, release = lock.acquire, lock.release", number) - loop_baseline
+
+def test_thread_lock(number=None):
+    """Same `with` block on a lock from _thread.allocate_lock() (threading.Lock's underlying factory)"""
+    return _bench("""
+        with raw_lock:
+            current_depth = counter
+            counter += 1
+    """, "counter = 0; raw_lock = _thread.allocate_lock()", number) - loop_baseline
 
-def test_with_logging_enabled(iterations):
-    """New code with logging (DEBUG enabled)"""
-    global counter
-    # Temporarily enable DEBUG logging
-    old_level = logging.getLogger().level
-    logging.getLogger().setLevel(logging.DEBUG)
+def test_with_ctypes_counter(number=None):
+    """Locked counter stored in a ctypes.c_uint64, incremented in place through .value"""
+    return _bench("""
+        with lock:
+            current_depth = counter.value
+            counter.value += 1
+    """, "counter = ctypes.c_uint64(0)", number) - loop_baseline
 
-    counter = 0
-    start = time.perf_counter()
+def test_with_array_counter(number=None):
+    """Locked counter stored as the single C slot of an array.array('Q')"""
+    return _bench("""
+        with lock:
+            current_depth = counter[0]
+            counter[0] += 1
+    """, "counter = array.array('Q', [0])", number) - loop_baseline
 
-    for i in range(iterations):
+def test_fused_two_ops(number=None):
+    """Enqueue and dequeue bookkeeping under a single lock acquisition (one critical section per request)"""
+    return _bench("""
         with lock:
-            current_depth = counter
             counter += 1
-            logging.debug(f"Request queued for {model_name} ({target_model_id}). Queue depth: {counter}/{max_size}")
-
-    elapsed = time.perf_counter() - start
-    logging.getLogger().setLevel(old_level)
-    return elapsed / iterations * 1_000_000
+            counter -= 1
+    """, "counter = 0", number) - loop_baseline
+
+def test_with_logging_O_mode():
+    """test_with_logging_disabled re-run in a `python -O` child, where the __debug__ guard folds away;
+    None if the child fails"""
+    try:
+        proc = subprocess.run([sys.executable, "-O", os.path.abspath(__file__), "--mode=debug-stripped"],
+                              capture_output=True, text=True, check=True, timeout=300)
+        return float(proc.stdout.split()[-1])
+    except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+        return None
+
+if DEBUG_STRIPPED_MODE:
+    print(_fmt6(test_with_logging_disabled()))
+    sys.exit(0)
 
 # Run tests
-iterations = 100_000
-
-print("Testing lock + counter operations...")
+print(f"Testing lock + counter operations (timeit, best of 7 runs after a {WARMUP_ITERATIONS:,}-iteration warmup, "
+      f"loop overhead subtracted)...")
+print(f"Empty-loop baseline: {_fmt3(loop_baseline)} μs per iteration")
 print()
 
-t_without = test_without_logging(iterations)
-print(f"WITHOUT logging: {t_without:.3f} μs per operation")
+t_without = test_without_logging()
+print(f"WITHOUT logging: {_fmt3(t_without)} μs per operation")
+
+t_atomic = test_with_atomic_counter()
+print(f"Atomic counter, no lock (itertools.count): {_fmt3(t_atomic)} μs per operation "
+      f"({_fmt3s(t_atomic - t_without)} μs vs lock)")
+
+t_list = test_with_list_counter()
+print(f"List counter, no lock (not thread-safe): {_fmt3(t_list)} μs per operation "
+      f"({_fmt3s(t_list - t_without)} μs vs lock)")
+
+t_try_finally = test_lock_try_finally()
+print(f"Lock via acquire/try/finally/release: {_fmt3(t_try_finally)} μs per operation "
+      f"({_fmt3s(t_try_finally - t_without)} μs vs with)")
+
+t_thread_lock = test_thread_lock()
+print(f"_thread.allocate_lock() with block: {_fmt3(t_thread_lock)} μs per operation "
+      f"({_fmt3s(t_thread_lock - t_without)} μs vs threading.Lock)")
+
+t_ctypes_counter = test_with_ctypes_counter()
+print(f"Locked ctypes.c_uint64 counter: {_fmt3(t_ctypes_counter)} μs per operation "
+      f"({_fmt3s(t_ctypes_counter - t_without)} μs vs int)")
+
+t_array_counter = test_with_array_counter()
+print(f"Locked array.array('Q') counter: {_fmt3(t_array_counter)} μs per operation "
+      f"({_fmt3s(t_array_counter - t_without)} μs vs int)")
+
+t_fused = test_fused_two_ops()
+print(f"Fused queue+dequeue (one lock, two updates): {_fmt3(t_fused)} μs per request "
+      f"(vs {_fmt3(t_without * 2)} μs for two separate lock operations)")
 
-t_with_disabled = test_with_logging_disabled(iterations)
-print(f"WITH logging (INFO level - disabled): {t_with_disabled:.3f} μs per operation")
+t_as_shipped = test_with_logging_as_shipped()
+print(f"WITH logging (INFO level - disabled, as shipped: unguarded f-string): {_fmt3(t_as_shipped)} μs per operation")
+t_with_disabled = test_with_logging_disabled()
+print(f"WITH logging (INFO level - disabled, guarded %-style): {_fmt3(t_with_disabled)} μs per operation "
+      f"({_fmt3s(t_with_disabled - t_as_shipped)} μs vs as shipped)")
+
+t_O_mode = test_with_logging_O_mode()
+if t_O_mode is None:
+    print("WITH logging under python -O: skipped (child process failed)")
+else:
+    print(f"WITH logging under python -O (debug branch compiled out): {_fmt3(t_O_mode)} μs per operation "
+          f"({_fmt3s(t_O_mode - t_without)} μs vs WITHOUT logging)")
 
 print("\nTesting with DEBUG enabled (smaller sample size)...")
-t_with_enabled = test_with_logging_enabled(10_000)
-print(f"WITH logging (DEBUG level - enabled): {t_with_enabled:.3f} μs per operation")
+t_with_enabled = test_with_logging_enabled(2_000)
+print(f"WITH logging (DEBUG level - enabled, to StringIO): {_fmt3(t_with_enabled)} μs per operation")
+t_record_only = test_with_logging_record_only(2_000)
+print(f"WITH logging (DEBUG enabled, NullHandler - record creation only): {_fmt3(t_record_only)} μs per operation "
+      f"({_fmt3s(t_record_only - t_with_enabled)} μs: formatting + StringIO write not included)")
+t_enabled_lean = test_with_logging_enabled_lean(2_000)
+print(f"WITH logging (DEBUG enabled, to StringIO, filename-discovery disabled): {_fmt3(t_enabled_lean)} μs per operation "
+      f"({_fmt3s(t_enabled_lean - t_with_enabled)} μs)")
+t_debug_stderr = test_with_debug_to_stderr(2_000)
+print(f"WITH logging (DEBUG enabled, to stderr): {_fmt3(t_debug_stderr)} μs per operation "
+      f"({_fmt3s(t_debug_stderr - t_with_enabled)} μs vs StringIO: the write(2) and terminal cost)")
+t_debug_memory = test_with_debug_to_memory_handler(2_000)
+print(f"WITH logging (DEBUG enabled, MemoryHandler): {_fmt3(t_debug_memory)} μs per operation")
+log_format = logging.getLogger().handlers[0].formatter._fmt
+t_plain_formatter = test_with_debug_formatter(2_000, logging.Formatter(log_format))
+t_memo_formatter = test_with_debug_formatter(2_000, MemoizingFormatter(log_format))
+print(f"WITH logging (DEBUG enabled, to StringIO, MemoizingFormatter): {_fmt3(t_memo_formatter)} μs per operation "
+      f"({_fmt3s(t_memo_formatter - t_plain_formatter)} μs vs plain Formatter on the same line)")
+t_enabled_prefixed = test_with_logging_enabled_prefixed(2_000)
+print(f"WITH logging (DEBUG enabled, to StringIO, precomputed prefix): {_fmt3(t_enabled_prefixed)} μs per operation "
+      f"({_fmt3s(t_enabled_prefixed - t_with_enabled)} μs)")
 
 print()
 print("=" * 80)
@@ -98,86 +417,211 @@ print("OVERHEAD ANALYSIS")
 print("=" * 80)
 print()
 
+overhead_shipped = t_as_shipped - t_without
 overhead_disabled = t_with_disabled - t_without
 overhead_enabled = t_with_enabled - t_without
 
-print(f"Overhead with DEBUG disabled: +{overhead_disabled:.3f} μs ({(overhead_disabled/t_without)*100:.1f}%)")
-print(f"Overhead with DEBUG enabled:  +{overhead_enabled:.3f} μs ({(overhead_enabled/t_without)*100:.1f}%)")
+print(f"Overhead with DEBUG disabled (as shipped): {_fmt3s(overhead_shipped)} μs ({_fmt1((overhead_shipped/t_without)*100)}%)")
+print(f"Overhead with DEBUG disabled (guarded):    {_fmt3s(overhead_disabled)} μs ({_fmt1((overhead_disabled/t_without)*100)}%)")
+print(f"Overhead with DEBUG enabled:               {_fmt3s(overhead_enabled)} μs ({_fmt1((overhead_enabled/t_without)*100)}%)")
+print(f"Removable by an atomic counter: {_fmt3(t_without - t_atomic)} μs of the {_fmt3(t_without)} μs lock+counter cost")
+print()
+
+# Per request impact as gateway/app.py runs it: the queue and dequeue sites each take the lock and log once
+print("PER-REQUEST IMPACT (2 lock operations + 2 debug calls: queue + dequeue):")
+print(f"  Production (INFO):  {_fmt3s(overhead_shipped * 2)} μs per request as shipped, "
+      f"{_fmt3s(overhead_disabled * 2)} μs guarded")
+print(f"  Debug (DEBUG):      {_fmt3s(overhead_enabled * 2)} μs per request")
+# Fusing the two updates into one critical section removes a lock operation, not a log call
+lock_fusion_saving = t_without * 2 - t_fused
+print("LOCK FUSION (both updates under 1 lock operation, still 2 debug calls):")
+print(f"  Lock cost saved:    {_fmt3(lock_fusion_saving)} μs per request")
+print()
+
+# How much of the per-op figure is bytecode dispatch rather than the lock itself: drive the same
+# calls from C (map/islice/deque are C iterators, so no Python frame runs between calls)
+print("=" * 80)
+print("INTERPRETER OVERHEAD (Python loop vs C-driven loop)")
+print("=" * 80)
+print()
+
+# operator.call is 3.11+; methodcaller("__call__") does the same a little slower
+_call = getattr(operator, "call", operator.methodcaller("__call__"))
+c_driven_ops = 100_000
+
+def test_lock_python_loop(number=None):
+    """Bare acquire+release pair, one Python loop iteration per pair"""
+    return _bench("acquire(); release()",
+                  "acquire, release = lock.acquire, lock.release", number) - loop_baseline
+
+def test_lock_c_driven(n=c_driven_ops):
+    """Same pair, n times, with the calls issued by a C iterator chain; μs per pair"""
+    return _bench("deque(map(_call, islice(cycle((lock.acquire, lock.release)), 2 * n)), maxlen=0)",
+                  f"from itertools import cycle, islice; n = {n}", number=1) / n
+
+def direct_call_c_driven(n=c_driven_ops):
+    """mock_request() called n times from C; μs per call"""
+    return _bench("deque(map(_call, itertools.repeat(mock_request, n)), maxlen=0)", f"""
+        def mock_request():
+            return "success"
+        n = {n}
+    """, number=1) / n
+
+t_lock_py = test_lock_python_loop()
+t_lock_c = test_lock_c_driven()
+t_call_c = direct_call_c_driven()
+print(f"Lock acquire+release, Python loop: {_fmt3(t_lock_py)} μs per pair")
+print(f"Lock acquire+release, C-driven:    {_fmt3(t_lock_c)} μs per pair ({_fmt3s(t_lock_c - t_lock_py)} μs vs Python loop)")
+print(f"mock_request(), C-driven:          {_fmt3(t_call_c)} μs per call")
 print()
 
-# Per request impact (2 calls: queue + dequeue)
-print("PER-REQUEST IMPACT (2 lock operations: queue + dequeue):")
-print(f"  Production (INFO):  +{overhead_disabled * 2:.3f} μs per request")
-print(f"  Debug (DEBUG):      +{overhead_enabled * 2:.3f} μs per request")
+# Single-threaded numbers never see contention: add a thread sweep over the same critical section
+print("=" * 80)
+print("CONTENDED LOCK TEST (thread sweep)")
+print("=" * 80)
 print()
 
+def test_contended(n_threads, iterations, acquire=lock.acquire, release=lock.release):
+    """n_threads threads each doing `iterations` acquire / counter += 1 / release; returns
+    wall-clock μs per operation across all threads (1 / aggregate throughput)"""
+    box = [0]
+    barrier = threading.Barrier(n_threads + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(iterations):
+            acquire()
+            box[0] += 1
+            release()
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = timeit.default_timer()
+    for t in threads:
+        t.join()
+    elapsed = timeit.default_timer() - start
+    assert box[0] == n_threads * iterations, "lost updates: lock did not serialize the counter"
+    return elapsed / (n_threads * iterations) * 1_000_000
+
+def _pthread_mutex_pair():
+    """acquire/release for a raw pthread_mutex_t driven through ctypes, or None off POSIX libc.
+
+    CDLL calls drop the GIL, so threads really contend on the OS mutex; the ctypes call cost
+    is included, which makes this an upper bound on the mutex itself."""
+    libc_name = ctypes.util.find_library("c")
+    if os.name != "posix" or libc_name is None:
+        return None
+    try:
+        libc = ctypes.CDLL(libc_name)
+        mutex = ctypes.create_string_buffer(64)  # >= sizeof(pthread_mutex_t) on common ABIs
+        if libc.pthread_mutex_init(mutex, None) != 0:
+            return None
+    except (OSError, AttributeError):
+        return None
+    lock_fn, unlock_fn = libc.pthread_mutex_lock, libc.pthread_mutex_unlock
+    return (lambda: lock_fn(mutex)), (lambda: unlock_fn(mutex))
+
+contended_iterations = 20_000  # per thread
+pthread_pair = _pthread_mutex_pair()
+
+# The sweep needs real parallelism, so lift the single-CPU pin for its duration
+if original_affinity is not None:
+    os.sched_setaffinity(0, original_affinity)
+
+test_contended(1, WARMUP_ITERATIONS)  # warmup, discarded
+print(f"{contended_iterations:,} lock+counter ops per thread (after a single-thread warmup)")
+print(f"{'Threads':>8}  {'threading.Lock':>23}  {'pthread_mutex (ctypes)':>25}")
+for n_threads in (1, 2, 4, 8, 16):
+    t_py = test_contended(n_threads, contended_iterations)
+    row = f"{n_threads:>8}  {t_py:>8.3f} μs {1 / t_py:>7.2f} M/s"
+    if pthread_pair is not None:
+        t_c = test_contended(n_threads, contended_iterations, *pthread_pair)
+        row += f"  {t_c:>10.3f} μs {1 / t_c:>7.2f} M/s"
+    print(row)
+if pthread_pair is None:
+    print("(pthread_mutex column skipped: no POSIX libc found via ctypes)")
+print()
+
+if bench_cpu is not None:
+    os.sched_setaffinity(0, {bench_cpu})
+
 # Now test retry loop overhead
 print("=" * 80)
 print("RETRY LOOP OVERHEAD TEST")
 print("=" * 80)
 print()
 
-def direct_call(iterations):
+def direct_call(number=None):
     """Direct function call"""
-    def mock_request():
-        return "success"
-
-    start = time.perf_counter()
-    for _ in range(iterations):
-        result = mock_request()
-    elapsed = time.perf_counter() - start
-    return elapsed / iterations * 1_000_000
-
-def with_retry_loop(iterations):
+    return _bench("result = mock_request()", """
+        def mock_request():
+            return "success"
+    """, number) - loop_baseline
+
+def _retry_slow_path(request, max_retries, first_exc):
+    """Cold path: the remaining attempts after the first one failed with `first_exc` (only reached
+    on errors); re-raises `first_exc` when no retries remain, the last failure otherwise"""
+    if max_retries <= 1:
+        raise first_exc
+    for retry_attempt in range(1, max_retries):
+        pass  # Would sleep here
+        try:
+            return request()
+        except Exception:
+            if retry_attempt == max_retries - 1:
+                raise
+
+def with_retry_loop(number=None):
     """With retry loop wrapper"""
-    def mock_request():
-        return "success"
-
-    start = time.perf_counter()
-    for _ in range(iterations):
+    # Success path is a single try around the first attempt; retries live in a cold helper
+    return _bench("""
+        try:
+            result = mock_request()
+        except Exception as e:
+            result = _retry_slow_path(mock_request, max_retries, e)
+    """, """
+        def mock_request():
+            return "success"
         max_retries = 3
-        for retry_attempt in range(max_retries):
-            try:
-                result = mock_request()
-                break
-            except (Exception,) as e:
-                if retry_attempt < max_retries - 1:
-                    pass  # Would sleep here
-                else:
-                    raise
-    elapsed = time.perf_counter() - start
-    return elapsed / iterations * 1_000_000
-
-t_direct = direct_call(1_000_000)
-t_retry = with_retry_loop(1_000_000)
-
-print(f"Direct call: {t_direct:.3f} μs")
-print(f"With retry loop: {t_retry:.3f} μs")
-print(f"Overhead: +{t_retry - t_direct:.3f} μs")
+    """, number) - loop_baseline
+
+t_direct = direct_call()
+t_retry = with_retry_loop()
+
+print(f"Direct call: {_fmt3(t_direct)} μs")
+print(f"With retry loop: {_fmt3(t_retry)} μs")
+print(f"Overhead: {_fmt3s(t_retry - t_direct)} μs")
 print()
 
 # Final summary
 print("=" * 80)
-print("TOTAL PER-REQUEST OVERHEAD")
+print("TOTAL PER-REQUEST OVERHEAD (as gateway/app.py runs it: 2 lock operations, 1 debug call each, + retry wrapper)")
 print("=" * 80)
 print()
 
-total_prod = (overhead_disabled * 2) + (t_retry - t_direct)
-total_debug = (overhead_enabled * 2) + (t_retry - t_direct)
+# gateway/app.py logs at the queue and dequeue sites, each under its own lock operation.
+# Production is what it runs today (two unguarded f-strings); the guarded figure is what the change would give
+total_prod = overhead_shipped * 2 + (t_retry - t_direct)
+total_prod_guarded = overhead_disabled * 2 + (t_retry - t_direct)
+total_debug = overhead_enabled * 2 + (t_retry - t_direct)
 
-print(f"Production (LOG_LEVEL=INFO):  {total_prod:.3f} μs = {total_prod/1000:.6f} ms")
-print(f"Debug (LOG_LEVEL=DEBUG):      {total_debug:.3f} μs = {total_debug/1000:.6f} ms")
+print(f"Production (LOG_LEVEL=INFO):  {_fmt3(total_prod)} μs = {_fmt6(total_prod/1000)} ms")
+print(f"  with guarded logging:       {_fmt3(total_prod_guarded)} μs = {_fmt6(total_prod_guarded/1000)} ms")
+print(f"Debug (LOG_LEVEL=DEBUG):      {_fmt3(total_debug)} μs = {_fmt6(total_debug/1000)} ms")
+print(f"Fusing the two lock operations would save a further {_fmt3(lock_fusion_saving)} μs per request")
 print()
 
 # Impact at scale
 print("At 1,000 req/s:")
-print(f"  Production: {total_prod * 1000 / 1000:.2f} ms/s = {(total_prod * 1000 / 1000) / 1000 * 100:.3f}% CPU")
-print(f"  Debug:      {total_debug * 1000 / 1000:.2f} ms/s = {(total_debug * 1000 / 1000) / 1000 * 100:.3f}% CPU")
+print(f"  Production: {_fmt2(total_prod * 1000 / 1000)} ms/s = {_fmt3((total_prod * 1000 / 1000) / 1000 * 100)}% CPU")
+print(f"  Debug:      {_fmt2(total_debug * 1000 / 1000)} ms/s = {_fmt3((total_debug * 1000 / 1000) / 1000 * 100)}% CPU")
 print()
 
 print("At 10,000 req/s:")
-print(f"  Production: {total_prod * 10000 / 1000:.1f} ms/s = {(total_prod * 10000 / 1000) / 1000 * 100:.2f}% CPU")
-print(f"  Debug:      {total_debug * 10000 / 1000:.1f} ms/s = {(total_debug * 10000 / 1000) / 1000 * 100:.2f}% CPU")
+print(f"  Production: {_fmt1(total_prod * 10000 / 1000)} ms/s = {_fmt2((total_prod * 10000 / 1000) / 1000 * 100)}% CPU")
+print(f"  Debug:      {_fmt1(total_debug * 10000 / 1000)} ms/s = {_fmt2((total_debug * 10000 / 1000) / 1000 * 100)}% CPU")
 print()
 
 # Verdict
@@ -186,27 +630,8 @@ print("VERDICT")
 print("=" * 80)
 print()
 
-if total_prod < 1:
-    verdict_prod = "NEGLIGIBLE (< 1 μs)"
-elif total_prod < 10:
-    verdict_prod = "VERY MINOR (< 10 μs)"
-elif total_prod < 100:
-    verdict_prod = "MINOR (< 100 μs)"
-elif total_prod < 1000:
-    verdict_prod = "MODERATE (< 1 ms)"
-else:
-    verdict_prod = "SIGNIFICANT (>= 1 ms)"
-
-if total_debug < 1:
-    verdict_debug = "NEGLIGIBLE (< 1 μs)"
-elif total_debug < 10:
-    verdict_debug = "VERY MINOR (< 10 μs)"
-elif total_debug < 100:
-    verdict_debug = "MINOR (< 100 μs)"
-elif total_debug < 1000:
-    verdict_debug = "MODERATE (< 1 ms)"
-else:
-    verdict_debug = "SIGNIFICANT (>= 1 ms)"
+verdict_prod = VERDICTS[bisect.bisect_right(VERDICT_THRESHOLDS_US, total_prod)]
+verdict_debug = VERDICTS[bisect.bisect_right(VERDICT_THRESHOLDS_US, total_debug)]
 
 print(f"Production Impact: {verdict_prod}")
 print(f"Debug Impact:      {verdict_debug}")
@@ -216,19 +641,19 @@ print("CONCLUSION:")
 print("-" * 80)
 if total_prod < 100:
     print("✓ These changes should NOT cause noticeable slowdown in production.")
-    print(f"  Total overhead is only {total_prod:.2f} μs ({total_prod/1000:.6f} ms) per request.")
+    print(f"  Total overhead is only {_fmt2(total_prod)} μs ({_fmt6(total_prod/1000)} ms) per request.")
 else:
     print("⚠️ WARNING: These changes add measurable overhead in production.")
-    print(f"  Total overhead is {total_prod:.2f} μs ({total_prod/1000:.6f} ms) per request.")
+    print(f"  Total overhead is {_fmt2(total_prod)} μs ({_fmt6(total_prod/1000)} ms) per request.")
 
 if total_debug > 1000:
     print()
     print("⚠️ CRITICAL: Do NOT enable DEBUG logging in production!")
-    print(f"  Overhead increases to {total_debug:.1f} μs ({total_debug/1000:.3f} ms) per request.")
+    print(f"  Overhead increases to {_fmt1(total_debug)} μs ({_fmt3(total_debug/1000)} ms) per request.")
 elif total_debug > 100:
     print()
     print("⚠️ WARNING: Be careful with DEBUG logging in production.")
-    print(f"  Overhead increases to {total_debug:.1f} μs per request.")
+    print(f"  Overhead increases to {_fmt1(total_debug)} μs per request.")
 print()
 
 print("=" * 80)
@@ -236,11 +661,11 @@ print("RECOMMENDATIONS")
 print("=" * 80)
 print()
 
-if overhead_disabled > 0.5:
-    print(f"1. Consider lazy logging to reduce f-string evaluation overhead:")
-    print(f"   Current overhead: {overhead_disabled:.2f} μs per log call")
-    print(f"   Change: logging.debug(f'msg {{var}}') → logging.debug('msg %s', var)")
-    print(f"   Savings: ~{overhead_disabled * 0.7:.2f} μs per log call")
+if overhead_shipped > 0.5:
+    print(f"1. Consider lazy, guarded logging to reduce f-string evaluation overhead:")
+    print(f"   Current overhead: {_fmt2(overhead_shipped)} μs per log call")
+    print(f"   Change: logging.debug(f'msg {{var}}') → if logger.isEnabledFor(logging.DEBUG): logger.debug('msg %s', var)")
+    print(f"   Savings: {_fmt2(overhead_shipped - overhead_disabled)} μs per log call (measured above)")
     print()
 
 print("2. Keep LOG_LEVEL=INFO in production (current default) ✓")
@@ -248,8 +673,21 @@ print()
 
 if overhead_enabled > 100:
     print(f"3. NEVER use LOG_LEVEL=DEBUG in production!")
-    print(f"   Adds {overhead_enabled:.1f} μs per lock operation")
+    print(f"   Adds {_fmt1(overhead_enabled)} μs per lock operation")
     print()
 
 print("4. Connection pool, retry logic, and config validation are all fine.")
 print()
+
+# Differences under 5% of the lock+counter cost are within run-to-run noise
+if t_thread_lock < t_without * 0.95 and threading.Lock is not _thread.allocate_lock:
+    print("5. Use _thread.allocate_lock() for the queue-depth counter lock:")
+    print(f"   Saves {_fmt3(t_without - t_thread_lock)} μs per lock operation")
+else:
+    print("5. Keep threading.Lock for the queue-depth counter lock ✓")
+    print("   (it is _thread.allocate_lock on CPython; the two measure the same primitive)"
+          if threading.Lock is _thread.allocate_lock else
+          f"   (_thread.allocate_lock() is within noise: {_fmt3s(t_thread_lock - t_without)} μs)")
+if t_try_finally < t_without * 0.95:
+    print(f"   acquire/try/finally/release beats `with` by {_fmt3(t_without - t_try_finally)} μs per lock operation")
+print()
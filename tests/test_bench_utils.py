@@ -0,0 +1,70 @@
+"""Unit tests for the shared benchmark helpers in bench_utils.
+
+Runnable directly (no pytest required):  python tests/test_bench_utils.py
+Also discoverable by pytest (test_* functions).
+"""
+
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_utils import MemoizingFormatter  # noqa: E402
+
+FMT = "%(levelname)s - %(message)s"
+
+
+def _record(msg, *args):
+    return logging.LogRecord("bench", logging.DEBUG, __file__, 1, msg, args, None)
+
+
+def _assert_same_output(msg, *args):
+    """MemoizingFormatter must render exactly what logging.Formatter does, cold and cached."""
+    plain, memo = logging.Formatter(FMT), MemoizingFormatter(FMT)
+    expected = plain.format(_record(msg, *args))
+    for _ in range(2):  # first call fills the prefix cache, second one hits it
+        record, untouched = _record(msg, *args), _record(msg, *args)
+        assert memo.format(record) == expected, (msg, args)
+        assert (record.msg, record.args) == (untouched.msg, untouched.args)  # restored for other handlers
+
+
+def test_memoizing_formatter_matches_plain_formatter():
+    # str / int last arg (the common per-model log line)
+    _assert_same_output("Request queued for %s (%s). Queue depth: %d", "gpt-4", "openai/gpt-4", 5)
+    _assert_same_output("a %s b %s", "x", "y")
+    # Tuple last arg: formatted as one value, not unpacked into the directive
+    _assert_same_output("a %s b %s", "x", (5,))
+    _assert_same_output("a %s b %s", "x", (5, 6))
+    # Dict last arg, and a lone dict (LogRecord turns that into mapping-style args)
+    _assert_same_output("a %s b %s", "x", {"k": 1})
+    _assert_same_output("a %(k)s", {"k": 1})
+    # Escaped percent and no-arg messages
+    _assert_same_output("100%% of %s", "x")
+    _assert_same_output("no args")
+    print("ok: MemoizingFormatter matches logging.Formatter")
+
+
+def test_memoizing_formatter_keeps_plain_errors():
+    """A wrong arg count must fail the same way, not produce a different message."""
+    for msg, args in (("%s %s", ("x",)), ("%s", ("x", "y")), ("%d", ("x",))):
+        try:
+            logging.Formatter(FMT).format(_record(msg, *args))
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("expected the plain Formatter to raise")
+        try:
+            MemoizingFormatter(FMT).format(_record(msg, *args))
+        except TypeError:
+            pass
+        else:
+            raise AssertionError(f"expected MemoizingFormatter to raise for {msg!r} % {args!r}")
+    print("ok: MemoizingFormatter error parity")
+
+
+if __name__ == "__main__":
+    tests = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for t in tests:
+        t()
+    print(f"\nAll {len(tests)} test functions passed.")
@@ -0,0 +1,103 @@
+"""Unit tests for the config.json fetch cache in app._fetch_config_json.
+
+Runnable directly (no pytest required):  python tests/test_config_fetch.py
+Also discoverable by pytest (test_* functions).
+
+Unlike the other test files these import app itself, so they need the gateway's dependencies
+(docker, fastapi, huggingface_hub, httpx); they are skipped when those aren't installed.
+docker.from_env() is patched out, so no Docker daemon is needed.
+"""
+
+import asyncio
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "gateway"))
+
+try:
+    import docker  # noqa: F401
+    import fastapi  # noqa: F401
+    import huggingface_hub  # noqa: F401
+    import httpx
+except ImportError as e:
+    SKIP_REASON = f"gateway dependencies not installed ({e.name})"
+else:
+    SKIP_REASON = None
+
+if SKIP_REASON and "pytest" in sys.modules:
+    import pytest
+    pytest.skip(SKIP_REASON, allow_module_level=True)
+
+if not SKIP_REASON:
+    os.environ.setdefault("MODELS_CONFIG_FILE", os.path.join(os.path.dirname(__file__), "no-such-models.yaml"))
+    with mock.patch("docker.from_env"):
+        import app  # noqa: E402
+
+URL = "https://huggingface.co/o/m/raw/main/config.json"
+
+
+class FakeClient:
+    """Stand-in for app.http_client: get() replays `outcomes` (a response, or an exception to raise)."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def get(self, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _response(status, body=None):
+    return httpx.Response(status, json=body, request=httpx.Request("GET", URL))
+
+
+def _fetch_all(client, n):
+    """Run _fetch_config_json n times against `client` on an empty cache; returns the results."""
+    app._config_json_cache.clear()
+
+    async def run():
+        return [await app._fetch_config_json(URL) for _ in range(n)]
+
+    with mock.patch.object(app, "http_client", client):
+        return asyncio.run(run())
+
+
+def test_transient_error_is_retried():
+    """A timeout isn't cached: the next call fetches again, and its success is cached."""
+    cfg = {"max_position_embeddings": 4096}
+    client = FakeClient(httpx.ConnectTimeout("timed out"), _response(200, cfg))
+    assert _fetch_all(client, 3) == [None, cfg, cfg]
+    assert client.calls == 2
+    print("ok: transient error retried")
+
+
+def test_server_error_is_retried():
+    """5xx / 429 are transient too."""
+    client = FakeClient(_response(503), _response(429), _response(200, {"n_positions": 2048}))
+    assert _fetch_all(client, 3) == [None, None, {"n_positions": 2048}]
+    assert client.calls == 3
+    print("ok: 5xx/429 retried")
+
+
+def test_not_found_and_unauthorized_are_cached():
+    """404 / 401 are definitive: cached as None, no second request."""
+    for status in (404, 401):
+        client = FakeClient(_response(status))
+        assert _fetch_all(client, 2) == [None, None]
+        assert client.calls == 1
+    print("ok: 404/401 cached")
+
+
+if __name__ == "__main__":
+    if SKIP_REASON:
+        print(f"skipped: {SKIP_REASON}")
+        sys.exit(0)
+    tests = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for t in tests:
+        t()
+    print(f"\nAll {len(tests)} test functions passed.")
@@ -0,0 +1,93 @@
+"""Unit tests for offline GGUF resolution in app._cached_gguf_path.
+
+Runnable directly (no pytest required):  python tests/test_gguf_cache.py
+Also discoverable by pytest (test_* functions).
+
+Like test_config_fetch.py these import app itself, so they need the gateway's dependencies
+(docker, fastapi, huggingface_hub, httpx); they are skipped when those aren't installed.
+The HF cache is a temp directory; snapshot_download / hf_hub_download are patched to read it.
+"""
+
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "gateway"))
+
+try:
+    import docker  # noqa: F401
+    import fastapi  # noqa: F401
+    import huggingface_hub  # noqa: F401
+    import httpx  # noqa: F401
+except ImportError as e:
+    SKIP_REASON = f"gateway dependencies not installed ({e.name})"
+else:
+    SKIP_REASON = None
+
+if SKIP_REASON and "pytest" in sys.modules:
+    import pytest
+    pytest.skip(SKIP_REASON, allow_module_level=True)
+
+if not SKIP_REASON:
+    os.environ.setdefault("MODELS_CONFIG_FILE", os.path.join(os.path.dirname(__file__), "no-such-models.yaml"))
+    with mock.patch("docker.from_env"):
+        import app  # noqa: E402
+
+REPO = "org/model-GGUF"  # no quantization in the name, so an entry without quant_hint has no hint
+Q4 = "model-Q4_K_M.gguf"
+Q8 = "model-Q8_0.gguf"
+
+
+def _resolve(cached_files, quant_hint, listing=None):
+    """_cached_gguf_path(REPO, quant_hint) against a cache holding `cached_files` and, if given,
+    a listing recorded by an earlier network lookup. Returns the file name it resolved, or None."""
+    with tempfile.TemporaryDirectory() as snapshot:
+        for name in cached_files:
+            open(os.path.join(snapshot, name), "w").close()
+
+        def fake_hf_hub_download(repo_id, filename, **kwargs):
+            path = os.path.join(snapshot, filename)
+            if not os.path.exists(path):
+                raise FileNotFoundError(path)  # stands in for LocalEntryNotFoundError
+            return path
+
+        app._gguf_listing_cache.clear()
+        if listing is not None:
+            app._gguf_listing_cache[REPO] = listing
+        with mock.patch.object(app, "snapshot_download", return_value=snapshot), \
+                mock.patch.object(app, "hf_hub_download", fake_hf_hub_download):
+            path = app._cached_gguf_path(REPO, quant_hint, None)
+        return os.path.basename(path) if path else None
+
+
+def test_hinted_entry_resolves_cached_match():
+    assert _resolve([Q8], "Q8_0") == Q8
+    assert _resolve([Q8], "Q4_K_M") is None
+    print("ok: hinted entry")
+
+
+def test_unhinted_entry_ignores_other_entrys_quant():
+    """Two entries share a multi-quant repo; the hinted one cached Q8. The un-hinted one must not
+    pick up that Q8 offline: the network path would choose the listing's first file (Q4)."""
+    assert _resolve([Q8], "Q8_0") == Q8
+    assert _resolve([Q8], "") is None
+    assert _resolve([Q8], "", listing=[Q4, Q8]) is None
+    print("ok: un-hinted entry doesn't swap quants")
+
+
+def test_unhinted_entry_uses_listing():
+    """With the repo's listing known, the file the network path picks is used from the cache."""
+    assert _resolve([Q8], "", listing=[Q8]) == Q8
+    assert _resolve([Q4, Q8], "", listing=[Q4, Q8]) == Q4
+    print("ok: un-hinted entry resolved via listing")
+
+
+if __name__ == "__main__":
+    if SKIP_REASON:
+        print(f"skipped: {SKIP_REASON}")
+        sys.exit(0)
+    tests = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
+    for t in tests:
+        t()
+    print(f"\nAll {len(tests)} test functions passed.")
@@ -13,7 +13,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "gateway"))
 from placement import (  # noqa: E402
     select_evictions, select_gpu, GpuView, select_placement, minimal_tp_to_fit, _homogeneous,
     select_colocated, compute_effective_tp, kv_cache_mib, estimate_need_mib,
-    attribute_vram, footprint_signature, signature_matches,
+    attribute_vram, footprint_signature, signature_matches, vram_settled,
 )
 import math  # noqa: E402
 
@@ -441,6 +441,17 @@ def test_footprint_signature_and_match():
     assert not signature_matches({}, sig)
 
 
+def test_vram_settled():
+    # Still growing (weights/KV allocating) -> not settled.
+    assert not vram_settled([1000.0, 6000.0, 9000.0])
+    # Last three within tolerance -> settled, regardless of the earlier ramp.
+    assert vram_settled([1000.0, 9000.0, 9020.0, 9030.0])
+    # Too few samples to judge.
+    assert not vram_settled([9000.0, 9000.0])
+    # Tolerance is exclusive.
+    assert not vram_settled([9000.0, 9000.0, 9050.0], window=3, tolerance_mib=50.0)
+
+
 if __name__ == "__main__":
     tests = [v for k, v in sorted(globals().items()) if k.startswith("test_") and callable(v)]
     for t in tests: